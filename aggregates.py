@@ -0,0 +1,125 @@
+# aggregates.py
+import os
+from collections import defaultdict
+
+from columnar import DepenseColumns
+from engine import split_parts, dues_from_totals, compute_weighted_shares_np
+
+# Vérifie à chaque rendu les totaux incrémentaux contre un recalcul complet
+VERIFY_AGGREGATES = os.environ.get("VERIFY_AGGREGATES") == "1"
+
+
+class Aggregates:
+    """Totaux tenus à jour à chaque ajout/suppression (lecture en O(1) au rendu).
+
+    - metrics : totaux affichés (total, alcool, viande), comme sur les pages
+    - split : montants répartissables (base, alcool, viande) pour les parts dues
+    - paid_by : total payé par payeur
+    """
+
+    def __init__(self):
+        self.n_depenses = 0
+        self.metrics = [0.0, 0.0, 0.0]
+        self.split = [0.0, 0.0, 0.0]
+        self.paid_by = defaultdict(float)
+        self._paid_count = defaultdict(int)
+        self.people = {}
+        self._dues = None
+
+    @classmethod
+    def from_state(cls, people, depenses):
+        return cls.from_columns(people, DepenseColumns(depenses))
+
+    @classmethod
+    def from_columns(cls, people, columns):
+        """Totaux initiaux calculés sur les colonnes typées (cf. columnar.py), en une passe NumPy."""
+        agg = cls()
+        for p in people:
+            agg.add_person(p)
+        agg.n_depenses = len(columns)
+        if agg.n_depenses:
+            agg.metrics = list(columns.totals())
+            agg.split = [float(v) for v in columns.price_matrix().sum(axis=0)]
+        sums, counts = columns.payer_sums()
+        for name, s, c in zip(columns.payers, sums, counts):
+            if c:
+                key = name or "Inconnu"
+                agg.paid_by[key] += float(s)
+                agg._paid_count[key] += int(c)
+        return agg
+
+    # ------------------ Mises à jour ------------------
+    def _apply_depense(self, d, sign):
+        self.n_depenses += sign
+        self.metrics[0] += sign * float(d.get("prix_depense", 0.0) or 0.0)
+        if d.get("alcool_boolean"):
+            self.metrics[1] += sign * float(d.get("alcool_prix", 0.0) or 0.0)
+        if d.get("nourriture_boolean"):
+            self.metrics[2] += sign * float(d.get("nourriture_prix", 0.0) or 0.0)
+        for i, part in enumerate(split_parts(d)):
+            self.split[i] += sign * part
+        payer = d.get("payeur_nom") or "Inconnu"
+        self.paid_by[payer] += sign * float(d.get("prix_depense", 0.0) or 0.0)
+        self._paid_count[payer] += sign
+        if self._paid_count[payer] <= 0:
+            del self.paid_by[payer], self._paid_count[payer]
+        if not self.n_depenses:
+            # Plus aucune dépense : on repart de zéro (pas de résidu d'arrondi)
+            self.metrics = [0.0, 0.0, 0.0]
+            self.split = [0.0, 0.0, 0.0]
+        self._dues = None
+
+    def add_depense(self, d):
+        self._apply_depense(d, 1)
+
+    def remove_depense(self, d):
+        self._apply_depense(d, -1)
+
+    def add_person(self, p):
+        self.people[p.get("id")] = p
+        self._dues = None
+
+    def remove_person(self, p):
+        self.people.pop(p.get("id"), None)
+        self._dues = None
+
+    # ------------------ Lectures ------------------
+    @property
+    def total(self):
+        return self.metrics[0]
+
+    @property
+    def total_alcool(self):
+        return self.metrics[1]
+
+    @property
+    def total_viande(self):
+        return self.metrics[2]
+
+    def dues(self):
+        """Parts dues par personne (recalculées seulement si les données ont changé)."""
+        if self._dues is None:
+            self._dues = dues_from_totals(list(self.people.values()), self.split)
+        return self._dues
+
+    def verify(self, people, depenses, tol=0.01):
+        """Compare avec un recalcul complet ; renvoie la liste des écarts (vide si tout concorde)."""
+        ref = Aggregates.from_state(people, depenses)
+        errors = []
+        for label, got, exp in (
+            ("total", self.total, ref.total),
+            ("total_alcool", self.total_alcool, ref.total_alcool),
+            ("total_viande", self.total_viande, ref.total_viande),
+        ):
+            if abs(got - exp) > tol:
+                errors.append(f"{label}: {got:.2f} ≠ {exp:.2f}")
+        for payer in set(self.paid_by) | set(ref.paid_by):
+            got, exp = self.paid_by.get(payer, 0.0), ref.paid_by.get(payer, 0.0)
+            if abs(got - exp) > tol:
+                errors.append(f"payé par {payer}: {got:.2f} ≠ {exp:.2f}")
+        dues, dues_ref = self.dues(), compute_weighted_shares_np(people, depenses)
+        for name in set(dues) | set(dues_ref):
+            got, exp = dues.get(name, 0.0), dues_ref.get(name, 0.0)
+            if abs(got - exp) > tol:
+                errors.append(f"part due {name}: {got:.2f} ≠ {exp:.2f}")
+        return errors
@@ -0,0 +1,464 @@
+# bench.py
+"""Benchmarks des fonctions cœur de l'app, sans lancer Streamlit.
+
+    python bench.py generate --people 500 --depenses 100000 --out storage.json
+    python bench.py run --people 500 --depenses 100000 --out bench_report.json
+    python bench.py imports --repeat 5
+    python bench.py stress --workers 8 --writes 50
+    python bench.py check                # vérifications de cohérence (code 1 en cas d'écart)
+"""
+import argparse
+import ast
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from uuid import UUID
+
+import sqlite_store
+import storage
+from columnar import DepenseColumns
+from aggregates import Aggregates
+from date_index import DateIndex, filter_depenses_by_date
+from engine import compute_weighted_shares, compute_weighted_shares_np, price_matrix
+from presence import compute_presence_shares
+from scenarios import run_scenarios
+from settlement import settlement_plan
+
+
+def generate_state(n_people=50, n_depenses=1000, start=datetime.date(2024, 1, 1), days=365, seed=0):
+    """Participants et dépenses synthétiques, au format écrit par l'app."""
+    rng = random.Random(seed)
+
+    def uid():
+        return str(UUID(int=rng.getrandbits(128), version=4))
+
+    people = []
+    for i in range(n_people):
+        arrive = start + datetime.timedelta(days=rng.randint(0, max(days - 1, 0)))
+        depart = min(arrive + datetime.timedelta(days=rng.randint(0, 30)), start + datetime.timedelta(days=days))
+        people.append({
+            "nom": f"Personne {i}",
+            "alcool_boolean": rng.random() < 0.7,
+            "alcool_classification": rng.randint(1, 10),
+            "nourriture_boolean": rng.random() < 0.8,
+            "nourriture_classification": rng.randint(1, 10),
+            "date_arrive": str(arrive),
+            "date_depart": str(depart),
+            "id": uid(),
+        })
+
+    names = [p["nom"] for p in people] or [""]
+    depenses = []
+    for i in range(n_depenses):
+        prix = round(rng.uniform(1, 300), 2)
+        alcool = rng.random() < 0.4
+        viande = rng.random() < 0.5
+        alcool_prix = round(rng.uniform(0, prix / 2), 2) if alcool else 0.0
+        nourriture_prix = round(rng.uniform(0, prix / 2), 2) if viande else 0.0
+        depenses.append({
+            "nom": f"Dépense {i}",
+            "prix_depense": prix,
+            "alcool_boolean": alcool,
+            "alcool_prix": alcool_prix,
+            "nourriture_boolean": viande,
+            "nourriture_prix": nourriture_prix,
+            "date_depense": str(start + datetime.timedelta(days=rng.randint(0, max(days - 1, 0)))),
+            "payeur_nom": rng.choice(names),
+            "id": uid(),
+        })
+    return people, depenses
+
+
+def timeit(fn, repeat=3):
+    """Temps d'exécution de fn() sur `repeat` essais (meilleur, moyenne)."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"best_s": min(times), "mean_s": statistics.mean(times), "repeat": repeat}
+
+
+def retained_bytes(build):
+    """Octets encore alloués après build() (tracemalloc) : taille en mémoire de la structure construite."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()  # gardé vivant jusqu'à la mesure
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def _chart_data(index, start_date, end_date):
+    """Préparation des données des graphiques du Résumé (cf. views/resume.py et charts.py)."""
+    import pandas as pd
+
+    total, total_alcool, total_viande = index.totals(start_date, end_date)
+    df_types = pd.DataFrame({
+        "Type": ["🍷 Alcool", "🍖 Viande", "💰 Autres"],
+        "Montant (€)": [total_alcool, total_viande, max(total - total_alcool - total_viande, 0.0)],
+    })
+    series = index.daily_series(start_date, end_date)
+    df_time = pd.DataFrame({"Date": list(series.keys()), "Dépenses (€)": list(series.values())})
+    paid_by = index.paid_by(start_date, end_date)
+    df_pay = pd.DataFrame({"Payeur": list(paid_by.keys()), "Payé (€)": list(paid_by.values())})
+    return df_types, df_time, df_pay
+
+
+def run(args):
+    people, depenses = generate_state(args.people, args.depenses, days=args.days, seed=args.seed)
+    start = datetime.date(2024, 1, 1) + datetime.timedelta(days=args.days // 4)
+    end = start + datetime.timedelta(days=args.days // 2)
+    results = {}
+
+    def bench(name, fn, repeat=args.repeat):
+        results[name] = timeit(fn, repeat)
+        print(f"{name:<40} {results[name]['best_s'] * 1000:10.2f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            path = os.path.join(tmp, f"{mode}.json")
+            storage.STORAGE_MODE = mode
+
+            def cold_load():
+                storage.invalidate_cache()
+                storage.load_state(path)
+
+            bench(f"replace_state[{mode}]", lambda: storage.replace_state(people, depenses, path))
+            bench(f"load_state[{mode}] (froid)", cold_load)
+            bench(f"load_state[{mode}] (cache)", lambda: storage.load_state(path))
+            extra = {"nom": "bench", "prix_depense": 1.0, "date_depense": "2024-01-01", "id": "bench"}
+            bench(f"record_add[{mode}]", lambda: storage.record_add("depenses", extra, path))
+        storage.STORAGE_MODE = "json"
+
+    n_ref = min(len(depenses), args.reference_limit)
+    bench(f"compute_weighted_shares ({n_ref} dépenses)", lambda: compute_weighted_shares(people, depenses[:n_ref]), 1)
+    bench("compute_weighted_shares_np", lambda: compute_weighted_shares_np(people, depenses))
+    bench("compute_presence_shares", lambda: compute_presence_shares(people, depenses))
+    split = price_matrix(depenses).sum(axis=0)
+    bench("run_scenarios (7 + 10000 scénarios)", lambda: run_scenarios(people, split, 10_000))
+    dues = compute_weighted_shares_np(people, depenses)
+    paid = DateIndex(depenses).paid_by(None, None)
+    bench("settlement_plan (glouton)", lambda: settlement_plan(dues, paid, "greedy"))
+    bench("filter_depenses_by_date", lambda: filter_depenses_by_date(depenses, start, end))
+    bench("DateIndex (construction)", lambda: DateIndex(depenses))
+    index = DateIndex(depenses)
+    bench("DateIndex.filter", lambda: index.filter(start, end))
+    bench("préparation graphiques", lambda: _chart_data(index, start, end))
+    bench("DepenseColumns (construction)", lambda: DepenseColumns(depenses))
+    columns = DepenseColumns(depenses)
+    bench("DateIndex (depuis les colonnes)", lambda: DateIndex(depenses, columns))
+    bench("compute_weighted_shares_np (colonnes)", lambda: compute_weighted_shares_np(people, columns))
+    bench("DepenseColumns.totals (période)", lambda: columns.totals(columns.date_mask(start, end)))
+    # Même mesure des deux côtés : mémoire retenue par la structure construite
+    text = json.dumps(depenses, ensure_ascii=False)
+    n = max(len(depenses), 1)
+    results["memoire_octets_par_depense"] = {
+        "colonnes": retained_bytes(lambda: DepenseColumns(depenses)) / n,
+        "dicts": retained_bytes(lambda: json.loads(text)) / n,
+    }
+    print(f"{'mémoire par dépense (colonnes / dicts)':<40} "
+          f"{results['memoire_octets_par_depense']['colonnes']:7.0f} / "
+          f"{results['memoire_octets_par_depense']['dicts']:.0f} octets")
+
+    report = {
+        "params": {"people": args.people, "depenses": args.depenses, "days": args.days,
+                   "seed": args.seed, "repeat": args.repeat, "modes": args.modes},
+        "python": platform.python_version(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Rapport écrit dans {args.out}")
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Mesure faite dans un interpréteur neuf : (durée en s, nombre de modules chargés)
+_IMPORT_PROBE = """
+import sys, time
+n = len(sys.modules)
+t0 = time.perf_counter()
+{imports}
+print(time.perf_counter() - t0, len(sys.modules) - n)
+"""
+
+
+def page_imports(path):
+    """Imports exécutés au chargement d'un script (niveau module seulement :
+    les imports différés dans les fonctions ne sont pas comptés)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def import_cost(statements, repeat=3):
+    """Coût à froid des imports donnés (meilleur de `repeat` processus neufs)."""
+    code = _IMPORT_PROBE.format(imports="\n".join(statements))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1])
+        seconds, modules = out.stdout.split()
+        runs.append((float(seconds), int(modules)))
+    return min(runs)
+
+
+def imports(args):
+    """Temps de démarrage par page : imports du point d'entrée, puis ceux de chaque page en plus."""
+    entry = page_imports(os.path.join(HERE, "app.py"))
+    results = {}
+
+    def report(name, statements):
+        seconds, modules = import_cost(statements, args.repeat)
+        results[name] = {"import_s": seconds, "modules": modules}
+        print(f"{name:<40} {seconds * 1000:10.2f} ms {modules:6d} modules")
+
+    report("app.py", entry)
+    views = os.path.join(HERE, "views")
+    for name in sorted(os.listdir(views)):
+        if name.endswith(".py"):
+            report(f"app.py + views/{name}", entry + page_imports(os.path.join(views, name)))
+    # Coût payé au premier graphique (charts.py importe ces modules à la demande)
+    report("graphiques (pandas + plotly.express)", entry + ["import pandas", "import plotly.express"])
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "repeat": args.repeat, "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Rapport écrit dans {args.out}")
+
+
+def _stress_worker(mode, path, worker, writes, compact_bytes):
+    """Un processus écrivain : ajoute `writes` dépenses, en supprimant une sur trois juste après."""
+    storage.STORAGE_MODE = mode
+    storage.JOURNAL_COMPACT_BYTES = compact_bytes  # compactions fréquentes pendant les ajouts
+    for i in range(writes):
+        item = {"nom": f"w{worker}-{i}", "prix_depense": 1.0, "date_depense": "2024-01-01",
+                "payeur_nom": "", "id": f"w{worker}-{i}"}
+        # Chaque écriture doit fusionner avec le fichier à jour (écrit par les autres processus)
+        storage.record_add("depenses", item, path)
+        if i % 3 == 2:
+            storage.record_delete("depenses", item["id"], path)
+
+
+def stress(args):
+    """Écrivains parallèles sur le même fichier : vérifie qu'aucune modification n'est perdue."""
+    expected = {f"w{w}-{i}" for w in range(args.workers) for i in range(args.writes) if i % 3 != 2}
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            path = os.path.join(tmp, f"{mode}.json")
+            storage.STORAGE_MODE = mode
+            storage.replace_state([], [], path)
+            t0 = time.perf_counter()
+            procs = [multiprocessing.Process(target=_stress_worker, args=(mode, path, w, args.writes, args.compact_bytes))
+                     for w in range(args.workers)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+            elapsed = time.perf_counter() - t0
+            storage.invalidate_cache()
+            found = {d["id"] for d in storage.load_state(path)[1]}
+            lost, extra = len(expected - found), len(found - expected)
+            failed = any(p.exitcode for p in procs)
+            ok = ok and not (lost or extra or failed)
+            status = "OK" if not (lost or extra or failed) else "ÉCHEC"
+            print(f"{mode:<8} {args.workers} processus × {args.writes} écritures en {elapsed:6.2f} s : "
+                  f"{len(found)}/{len(expected)} dépenses, {lost} perdue(s), {extra} en trop -> {status}")
+    storage.STORAGE_MODE = "json"
+    return ok
+
+
+# Écart admis entre les parts dues arrondies des deux moteurs (cf. engine.compute_weighted_shares_np)
+SHARES_TOLERANCE = 0.01 + 1e-9
+
+
+def _same(a, b):
+    """Mêmes items, à l'ordre et aux champs vides près (SQLite renvoie toutes les colonnes)."""
+    def norm(items):
+        return sorted(json.dumps({k: v for k, v in i.items() if v not in (None, "")}, sort_keys=True, default=str)
+                      for i in items)
+    return norm(a) == norm(b)
+
+
+def check_sqlite(people, depenses):
+    """Mode sqlite sur une base fichier temporaire : mêmes résultats que le mode json, cache relu après écriture."""
+    failures = []
+
+    def expect(name, cond):
+        if not cond:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "storage.json")
+        storage.STORAGE_MODE = "json"
+        storage.replace_state(people, depenses, path)
+        ref_people, ref_depenses = storage.load_state(path)
+        storage.STORAGE_MODE = "sqlite"
+        try:
+            got_people, got_depenses = storage.load_state(path)  # import du storage.json
+            expect("sqlite : import du storage.json", _same(got_people, ref_people) and _same(got_depenses, ref_depenses))
+            expect("sqlite : load_people", _same(storage.load_people(path), ref_people))
+            expect("sqlite : load_aggregates en cache", storage.load_aggregates(path) is storage.load_aggregates(path))
+            expect("sqlite : load_date_index en cache", storage.load_date_index(path) is storage.load_date_index(path))
+            v0 = storage.data_version(path)
+            expect("sqlite : data_version stable sans écriture", storage.data_version(path) == v0)
+            storage.invalidate_cache()
+            storage.data_version(path)
+            expect("sqlite : data_version sans chargement", sqlite_store.db_path(path) not in storage._cache)
+
+            item = {"nom": "check", "prix_depense": 12.5, "alcool_boolean": False, "alcool_prix": 0.0,
+                    "nourriture_boolean": False, "nourriture_prix": 0.0, "date_depense": "2024-06-01",
+                    "payeur_nom": "", "id": "check"}
+            storage.record_add("depenses", item, path)
+            expect("sqlite : data_version après ajout", storage.data_version(path) != v0)
+            expect("sqlite : ajout visible", _same(storage.load_state(path)[1], ref_depenses + [item]))
+            expect("sqlite : totaux après ajout",
+                   abs(storage.load_aggregates(path).total - DateIndex(ref_depenses).totals(None, None)[0] - 12.5) < 1e-6)
+            storage.record_delete("depenses", "check", path)
+            expect("sqlite : suppression visible", _same(storage.load_state(path)[1], ref_depenses))
+
+            db = sqlite_store.db_path(path)
+            index = DateIndex(ref_depenses)
+            for start, end in ((None, None), (datetime.date(2024, 3, 1), datetime.date(2024, 6, 30))):
+                expect(f"sqlite : totaux {start}..{end}",
+                       all(abs(a - b) < 1e-6 for a, b in zip(sqlite_store.totals(db, start, end), index.totals(start, end))))
+        finally:
+            storage.STORAGE_MODE = "json"
+            storage.invalidate_cache()
+    return failures
+
+
+def check_weighted_shares(n_people, n_depenses, seeds):
+    """compute_weighted_shares_np face à la boucle de référence : écart d'au plus 0,01 € par personne."""
+    failures, exact = [], 0
+    for seed in seeds:
+        people, depenses = generate_state(n_people, n_depenses, seed=seed)
+        ref, got = compute_weighted_shares(people, depenses), compute_weighted_shares_np(people, depenses)
+        gap = max((abs(ref[n] - got.get(n, float("inf"))) for n in ref), default=0.0)
+        if set(ref) != set(got) or gap > SHARES_TOLERANCE:
+            failures.append(f"compute_weighted_shares_np : graine {seed}, écart {gap:.4f} €")
+        exact += gap == 0
+    print(f"compute_weighted_shares_np : {exact}/{len(seeds)} graine(s) identiques au centime, "
+          "les autres à 0,01 € près")
+    return failures
+
+
+def check_columns(people, depenses):
+    """Totaux et index tirés des colonnes face au calcul ligne à ligne sur les dicts."""
+    failures = []
+    agg, ref = Aggregates.from_state(people, depenses), Aggregates()
+    for p in people:
+        ref.add_person(p)
+    for d in depenses:
+        ref.add_depense(d)
+    if agg.verify(people, depenses) or ref.verify(people, depenses) or agg.dues() != ref.dues():
+        failures.append("Aggregates.from_columns : écart avec l'ajout ligne à ligne")
+    index = DateIndex(depenses)
+    start, end = datetime.date(2024, 3, 1), datetime.date(2024, 6, 30)
+    period = filter_depenses_by_date(depenses, start, end)
+    expected = sum(float(d["prix_depense"]) for d in period)
+    if abs(index.totals(start, end)[0] - expected) > 1e-6 or len(index.filter(start, end)) != len(period):
+        failures.append("DateIndex : totaux ou filtre de période différents de filter_depenses_by_date")
+    return failures
+
+
+def check_incremental(people, depenses):
+    """Modes json et journal : un ajout ou une suppression met à jour les totaux en cache sans les reconstruire."""
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("json", "journal"):
+            path = os.path.join(tmp, f"{mode}.json")
+            storage.STORAGE_MODE = mode
+            try:
+                storage.replace_state(people, depenses, path)
+                agg = storage.load_aggregates(path)
+                item = dict(depenses[0], id="check") if depenses else {"nom": "check", "prix_depense": 1.0, "id": "check"}
+                storage.record_add("depenses", item, path)
+                storage.record_delete_many("depenses", [d["id"] for d in depenses[1:3]], path)
+                storage.compact(path)
+                if storage.load_aggregates(path) is not agg:
+                    failures.append(f"{mode} : totaux reconstruits après écriture")
+                if agg.verify(*storage.load_state(path)):
+                    failures.append(f"{mode} : totaux incrémentaux incohérents")
+            finally:
+                storage.STORAGE_MODE = "json"
+                storage.invalidate_cache()
+    return failures
+
+
+def check(args):
+    """Vérifications de cohérence entre implémentations ; False (code de sortie 1) en cas d'écart."""
+    people, depenses = generate_state(args.people, args.depenses, seed=args.seed)
+    failures = check_sqlite(people, depenses)
+    failures += check_columns(people, depenses)
+    failures += check_incremental(people, depenses)
+    failures += check_weighted_shares(args.people, args.depenses, range(args.seed, args.seed + args.seeds))
+    for name in failures:
+        print(f"ÉCHEC {name}")
+    print("OK" if not failures else f"{len(failures)} vérification(s) en échec")
+    return not failures
+
+
+def generate(args):
+    people, depenses = generate_state(args.people, args.depenses, days=args.days, seed=args.seed)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"people": people, "depenses": depenses}, f, ensure_ascii=False, indent=2)
+    print(f"{len(people)} participants et {len(depenses)} dépenses écrits dans {args.out}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, fn, out in (("generate", generate, "storage.json"), ("run", run, "bench_report.json")):
+        p = sub.add_parser(name)
+        p.add_argument("--people", type=int, default=200)
+        p.add_argument("--depenses", type=int, default=10_000)
+        p.add_argument("--days", type=int, default=365)
+        p.add_argument("--seed", type=int, default=0)
+        p.add_argument("--out", default=out)
+        p.set_defaults(func=fn)
+        if name == "run":
+            p.add_argument("--repeat", type=int, default=3)
+            p.add_argument("--modes", nargs="+", default=["json", "journal", "sqlite"],
+                           choices=["json", "journal", "sqlite"])
+            p.add_argument("--reference-limit", type=int, default=2000,
+                           help="nombre max de dépenses pour la version pur Python (lente)")
+    p = sub.add_parser("stress", help="écritures concurrentes depuis plusieurs processus")
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--writes", type=int, default=30)
+    p.add_argument("--modes", nargs="+", default=["json", "journal", "sqlite"],
+                   choices=["json", "journal", "sqlite"])
+    p.add_argument("--compact-bytes", type=int, default=4000,
+                   help="seuil de compaction du journal pendant le test")
+    p.set_defaults(func=stress)
+    p = sub.add_parser("imports", help="temps d'import à froid de chaque page")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--out", default=None)
+    p.set_defaults(func=imports)
+    p = sub.add_parser("check", help="vérifications de cohérence (sqlite / json, parts dues)")
+    p.add_argument("--people", type=int, default=20)
+    p.add_argument("--depenses", type=int, default=500)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--seeds", type=int, default=30, help="nombre de jeux de données pour la parité des parts dues")
+    p.set_defaults(func=check)
+    args = parser.parse_args(argv)
+    if args.func(args) is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# charts.py
+import datetime
+import threading
+from collections import OrderedDict
+
+from instrumentation import span
+
+# Au-delà, la série temporelle est regroupée par semaine puis par mois
+MAX_POINTS = 366
+CACHE_SIZE = 64  # jeux de figures gardés (toutes sessions confondues)
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def cached(key, build):
+    """Résultat de build() mémoïsé sous `key` (LRU borné à CACHE_SIZE entrées)."""
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    value = build()
+    with _lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return value
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+def downsample(series, max_points=MAX_POINTS):
+    """{date: montant} -> (série regroupée, pas) avec au plus max_points points si possible.
+
+    Pas : "jour", puis "semaine" (lundi) ou "mois" (1er du mois).
+    """
+    if len(series) <= max_points:
+        return dict(sorted(series.items())), "jour"
+    for label, bucket in (
+        ("semaine", lambda d: d - datetime.timedelta(days=d.weekday())),
+        ("mois", lambda d: d.replace(day=1)),
+    ):
+        out = {}
+        for d, v in series.items():
+            b = bucket(d)
+            out[b] = out.get(b, 0.0) + v
+        if len(out) <= max_points or label == "mois":
+            return dict(sorted(out.items())), label
+
+
+def resume_figures(version, start_date, end_date, type_totals, get_inputs):
+    """Figures du « Résumé des dépenses » pour une version des données et une période.
+
+    type_totals : (alcool, viande, autres) ; get_inputs() -> (série par jour,
+    payé par payeur), appelé seulement si les figures ne sont pas en cache.
+    """
+    @span("figures plotly (construction)")
+    def build():
+        import pandas as pd
+        import plotly.express as px
+
+        total_alcool, total_viande, total_autres = type_totals
+        df_types = pd.DataFrame(
+            {"Type": ["🍷 Alcool", "🍖 Viande", "💰 Autres"], "Montant (€)": [total_alcool, total_viande, total_autres]}
+        )
+        figs = {"types": px.pie(df_types, names="Type", values="Montant (€)", title="Répartition par type")}
+
+        series_by_date, paid_by = get_inputs()
+        figs["line"] = None
+        if series_by_date:
+            series, step = downsample(series_by_date)
+            df_time = pd.DataFrame({"Date": list(series.keys()), "Dépenses (€)": list(series.values())})
+            title = "Évolution des dépenses" + ("" if step == "jour" else f" (par {step})")
+            figs["line"] = px.line(df_time, x="Date", y="Dépenses (€)", markers=True, title=title)
+
+        figs["pay"] = None
+        if paid_by:
+            df_pay = pd.DataFrame({"Payeur": list(paid_by.keys()), "Payé (€)": list(paid_by.values())})
+            figs["pay"] = px.bar(df_pay, x="Payeur", y="Payé (€)", title="Part de chaque payeur")
+        return figs
+
+    return cached(("resume", version, start_date, end_date), build)
+
+
+def profile_figures(version, people):
+    """Camemberts d'intensité (nourriture, alcool) du groupe ; None si tous les scores sont nuls."""
+    @span("figures plotly (construction)")
+    def build():
+        import pandas as pd
+        import plotly.express as px
+
+        figs = {}
+        for key, flag, score, title in (
+            ("food", "nourriture_boolean", "nourriture_classification", "Consommation de nourriture (scores 1–10)"),
+            ("alc", "alcool_boolean", "alcool_classification", "Consommation d'alcool (scores 1–10)"),
+        ):
+            data = []
+            for p in people:
+                name = p.get("nom")
+                if not name:
+                    continue
+                w = p.get(score) if p.get(flag) else 0
+                data.append({"Personne": name, "Score": int(w or 0)})
+            df = pd.DataFrame(data, columns=["Personne", "Score"])
+            figs[key] = px.pie(df, names="Personne", values="Score", title=title) if df["Score"].sum() > 0 else None
+        return figs
+
+    return cached(("profils", version), build)
+
+
+def scenario_figure(key, rows):
+    """Médiane des parts dues par personne, barres d'erreur P5–P95 et part actuelle (losange)."""
+    @span("figures plotly (construction)")
+    def build():
+        import pandas as pd
+        import plotly.express as px
+
+        df = pd.DataFrame(rows)
+        df["bas"] = df["Médiane (€)"] - df["P5 (€)"]
+        df["haut"] = df["P95 (€)"] - df["Médiane (€)"]
+        fig = px.bar(df, x="Participant", y="Médiane (€)", error_y="haut", error_y_minus="bas",
+                     title="Parts dues selon les scénarios (médiane, P5–P95)")
+        fig.add_scatter(x=df["Participant"], y=df["Actuel (€)"], mode="markers", name="Actuel",
+                        marker={"symbol": "diamond", "size": 9})
+        return fig
+
+    return cached(("scenarios",) + tuple(key), build)
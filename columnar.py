@@ -0,0 +1,201 @@
+# columnar.py
+"""Représentation en colonnes typées (NumPy) des participants et des dépenses.
+
+Construite une fois par version des données (cf. storage.load_columns) ;
+les totaux, l'index par date et la matrice des prix en sont tirés sans
+repasser par les dicts.
+"""
+import datetime
+import sys
+from dataclasses import asdict
+
+import numpy as np
+
+from models import Person, Depense
+
+EPOCH = datetime.date(1970, 1, 1).toordinal()
+NO_DAY = np.iinfo(np.int32).min  # date manquante ou invalide
+
+
+def to_day(obj):
+    """date ou str ISO -> numéro de jour depuis 1970-01-01 (NO_DAY si invalide), comme date_index.to_date."""
+    if isinstance(obj, str) and obj:
+        try:
+            obj = datetime.date.fromisoformat(obj)
+        except ValueError:
+            return NO_DAY
+    if isinstance(obj, datetime.date):
+        return obj.toordinal() - EPOCH
+    return NO_DAY
+
+
+def from_day(day):
+    return None if day == NO_DAY else datetime.date.fromordinal(int(day) + EPOCH)
+
+
+def _days(values):
+    """Numéros de jour (int32) ; chaque chaîne distincte n'est parsée qu'une fois."""
+    memo = {}
+    out = np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        key = v if isinstance(v, str) else str(v)
+        day = memo.get(key)
+        if day is None:
+            day = memo[key] = to_day(v)
+        out[i] = day
+    return out
+
+
+def _categorize(values):
+    """(codes int32, catégories) : chaque valeur distincte n'est stockée qu'une fois."""
+    cats = {}
+    codes = np.fromiter((cats.setdefault(v, len(cats)) for v in values), dtype=np.int32, count=len(values))
+    return codes, list(cats)
+
+
+def _floats(records, key):
+    return np.fromiter((float(r.get(key, 0.0) or 0.0) for r in records), dtype=np.float64, count=len(records))
+
+
+def _flags(records, key):
+    return np.fromiter((bool(r.get(key)) for r in records), dtype=bool, count=len(records))
+
+
+def _notes(records, key):
+    """Notes en float64 ; une note non numérique vaut 0 (comme engine._num)."""
+    return np.fromiter(
+        (float(x) if isinstance(x, (int, float)) else 0.0 for x in (r.get(key) or 0 for r in records)),
+        dtype=np.float64, count=len(records),
+    )
+
+
+class DepenseColumns:
+    """Dépenses en colonnes typées : prix float64, drapeaux bool, dates int32, textes catégoriels.
+
+    La ligne i correspond à la i-ème dépense de la liste passée au constructeur.
+    """
+
+    def __init__(self, depenses):
+        n = len(depenses)
+        self.ids = np.array([str(d.get("id", "")) for d in depenses], dtype=str)
+        self.nom_codes, self.noms = _categorize([d.get("nom") or "" for d in depenses])
+        self.prix = _floats(depenses, "prix_depense")
+        self.alcool = _flags(depenses, "alcool_boolean")
+        self.alcool_prix = _floats(depenses, "alcool_prix")
+        self.viande = _flags(depenses, "nourriture_boolean")
+        self.viande_prix = _floats(depenses, "nourriture_prix")
+        self.day = _days([d.get("date_depense") for d in depenses]) if n else np.empty(0, dtype=np.int32)
+        self.payer_codes, self.payers = _categorize([d.get("payeur_nom") or "" for d in depenses])
+
+    def __len__(self):
+        return len(self.prix)
+
+    @property
+    def nbytes(self):
+        """Mémoire des colonnes et des catégories, en octets."""
+        arrays = (self.ids, self.nom_codes, self.prix, self.alcool, self.alcool_prix,
+                  self.viande, self.viande_prix, self.day, self.payer_codes)
+        return sum(a.nbytes for a in arrays) + sum(sys.getsizeof(s) for s in self.noms + self.payers)
+
+    # ------------------ Accès ligne ------------------
+    def row(self, i):
+        """Dépense i sous forme de dataclass Depense."""
+        return Depense(
+            nom=self.noms[self.nom_codes[i]],
+            prix_depense=float(self.prix[i]),
+            alcool_boolean=bool(self.alcool[i]),
+            alcool_prix=float(self.alcool_prix[i]),
+            nourriture_boolean=bool(self.viande[i]),
+            nourriture_prix=float(self.viande_prix[i]),
+            date_depense=from_day(self.day[i]),
+            payeur_nom=self.payers[self.payer_codes[i]],
+        )
+
+    def record(self, i):
+        """Dépense i au format dict de storage.json."""
+        out = asdict(self.row(i))
+        out["date_depense"] = str(out["date_depense"]) if out["date_depense"] else None
+        out["id"] = str(self.ids[i])
+        return out
+
+    # ------------------ Agrégations ------------------
+    def amounts(self):
+        """(total, alcool, viande) par dépense : les montants affichés, catégorie non cochée à 0."""
+        return (
+            self.prix,
+            np.where(self.alcool, self.alcool_prix, 0.0),
+            np.where(self.viande, self.viande_prix, 0.0),
+        )
+
+    def price_matrix(self):
+        """Matrice (n x 3) base / alcool / viande, comme engine.price_matrix."""
+        prix, alcool, viande = self.amounts()
+        base = np.maximum(prix - alcool - viande, 0.0)
+        return np.column_stack((base, np.maximum(alcool, 0.0), np.maximum(viande, 0.0)))
+
+    def date_mask(self, start_date=None, end_date=None):
+        """Masque des dépenses datées dans [start_date, end_date] (ou de toutes si aucun filtre)."""
+        if not start_date and not end_date:
+            return np.ones(len(self), dtype=bool)
+        mask = self.day != NO_DAY
+        if start_date:
+            mask &= self.day >= to_day(start_date)
+        if end_date:
+            mask &= self.day <= to_day(end_date)
+        return mask
+
+    def totals(self, mask=None):
+        """(total, total_alcool, total_viande) des dépenses sélectionnées."""
+        sel = slice(None) if mask is None else mask
+        return tuple(float(a[sel].sum()) for a in self.amounts())
+
+    def payer_sums(self, mask=None):
+        """(montant payé, nombre de dépenses) par code de payeur (tableaux alignés sur self.payers)."""
+        codes = self.payer_codes if mask is None else self.payer_codes[mask]
+        prix = self.prix if mask is None else self.prix[mask]
+        return (np.bincount(codes, weights=prix, minlength=len(self.payers)),
+                np.bincount(codes, minlength=len(self.payers)))
+
+    def paid_by(self, mask=None):
+        """{payeur: montant payé} (payeur vide -> "Inconnu")."""
+        sums, counts = self.payer_sums(mask)
+        return paid_by_names(self.payers, sums, counts)
+
+
+def paid_by_names(payers, sums, counts):
+    """{payeur: montant payé} à partir des sommes par code (payeur vide -> "Inconnu")."""
+    out = {}
+    for name, s, c in zip(payers, sums, counts):
+        if c:
+            key = name or "Inconnu"
+            out[key] = out.get(key, 0.0) + float(s)
+    return out
+
+
+class PeopleColumns:
+    """Participants en colonnes : drapeaux, notes float64 et dates int32."""
+
+    def __init__(self, people):
+        self.ids = [str(p.get("id", "")) for p in people]
+        self.noms = [p.get("nom") or "" for p in people]
+        self.alcool = _flags(people, "alcool_boolean")
+        self.alcool_note = _notes(people, "alcool_classification")
+        self.viande = _flags(people, "nourriture_boolean")
+        self.viande_note = _notes(people, "nourriture_classification")
+        self.arrive = _days([p.get("date_arrive") for p in people]) if people else np.empty(0, dtype=np.int32)
+        self.depart = _days([p.get("date_depart") for p in people]) if people else np.empty(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.noms)
+
+    def row(self, i):
+        """Participant i sous forme de dataclass Person."""
+        return Person(
+            self.noms[i],
+            bool(self.alcool[i]),
+            float(self.alcool_note[i]),
+            bool(self.viande[i]),
+            float(self.viande_note[i]),
+            from_day(self.arrive[i]),
+            from_day(self.depart[i]),
+        )
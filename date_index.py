@@ -0,0 +1,102 @@
+# date_index.py
+import datetime
+
+import numpy as np
+
+from columnar import EPOCH, NO_DAY, DepenseColumns, paid_by_names
+
+
+def to_date(obj):
+    """Accepte date ou str ISO ('YYYY-MM-DD') -> datetime.date"""
+    if isinstance(obj, datetime.date):
+        return obj
+    if isinstance(obj, str) and obj:
+        try:
+            return datetime.date.fromisoformat(obj)
+        except ValueError:
+            pass
+    return None
+
+
+def filter_depenses_by_date(depenses, start_date, end_date):
+    """Filtre d par date_depense dans [start_date, end_date] (bornes incluses)"""
+    if not start_date and not end_date:
+        return depenses
+    out = []
+    for d in depenses:
+        dd = to_date(d.get("date_depense"))
+        if not dd:
+            continue
+        if start_date and dd < start_date:
+            continue
+        if end_date and dd > end_date:
+            continue
+        out.append(d)
+    return out
+
+
+class DateIndex:
+    """Dépenses triées par date_depense, construites à partir des colonnes typées.
+
+    Une période [start_date, end_date] se résout en deux recherches
+    dichotomiques ; les totaux de la période et la série par jour viennent
+    de sommes préfixes, le payé par payeur d'un comptage sur les codes.
+    `columns` (DepenseColumns des mêmes dépenses, dans le même ordre) évite
+    de les reconstruire (cf. storage.load_columns).
+    """
+
+    def __init__(self, depenses, columns=None):
+        cols = columns if columns is not None else DepenseColumns(depenses)
+        dated = np.flatnonzero(cols.day != NO_DAY)
+        order = dated[np.argsort(cols.day[dated], kind="stable")]  # l'ordre d'origine est gardé dans une journée
+        self.ordinals = cols.day[order].astype(np.int64) + EPOCH
+        self.items = [depenses[i] for i in order.tolist()]
+        self.split = cols.price_matrix()[order]  # base / alcool / viande, triés par date
+        self.payer_codes = cols.payer_codes[order]
+        self.payers = cols.payers
+        prix, alcool, viande = (a[order] for a in cols.amounts())
+        self.prix = prix
+
+        # Sommes préfixes par dépense : prefix[:, i] = cumul des i premières dépenses
+        n = len(order)
+        self.prefix = np.zeros((3, n + 1), dtype=np.float64)
+        np.cumsum(np.vstack((prix, alcool, viande)), axis=1, out=self.prefix[:, 1:])
+
+        # Jours distincts et montant de chaque jour
+        self.days, starts = np.unique(self.ordinals, return_index=True)
+        self.day_totals = np.add.reduceat(prix, starts) if n else np.zeros(0)
+
+    def _bounds(self, start_date, end_date):
+        lo = int(np.searchsorted(self.ordinals, start_date.toordinal(), side="left")) if start_date else 0
+        hi = int(np.searchsorted(self.ordinals, end_date.toordinal(), side="right")) if end_date else len(self.ordinals)
+        return lo, max(lo, hi)
+
+    def filter(self, start_date, end_date):
+        """Dépenses datées dans [start_date, end_date], triées par date."""
+        lo, hi = self._bounds(start_date, end_date)
+        return self.items[lo:hi]
+
+    def totals(self, start_date, end_date):
+        """(total, total_alcool, total_viande) sur la période, en O(log n)."""
+        lo, hi = self._bounds(start_date, end_date)
+        t = self.prefix[:, hi] - self.prefix[:, lo]
+        return float(t[0]), float(t[1]), float(t[2])
+
+    def paid_by(self, start_date, end_date):
+        """{payeur: montant payé} sur la période."""
+        lo, hi = self._bounds(start_date, end_date)
+        codes = self.payer_codes[lo:hi]
+        return paid_by_names(
+            self.payers,
+            np.bincount(codes, weights=self.prix[lo:hi], minlength=len(self.payers)),
+            np.bincount(codes, minlength=len(self.payers)),
+        )
+
+    def daily_series(self, start_date, end_date):
+        """{date: montant du jour} sur la période (jours sans dépense exclus)."""
+        lo = np.searchsorted(self.days, start_date.toordinal(), side="left") if start_date else 0
+        hi = np.searchsorted(self.days, end_date.toordinal(), side="right") if end_date else len(self.days)
+        return {
+            datetime.date.fromordinal(int(o)): float(v)
+            for o, v in zip(self.days[lo:hi], self.day_totals[lo:hi])
+        }
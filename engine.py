@@ -0,0 +1,150 @@
+# engine.py
+import numpy as np
+
+from columnar import DepenseColumns
+from instrumentation import instrument
+
+# Colonnes de prix : base (hors alcool/viande), alcool, viande
+CATEGORIES = ("base", "alcool", "viande")
+
+
+def safe_sum(values):
+    return sum(v for v in values if isinstance(v, (int, float)))
+
+
+@instrument()
+def compute_weighted_shares(people, depenses):
+    """Calcule les parts dues par personne selon pondération"""
+    if not people:
+        return {}
+
+    dues = {p["nom"]: 0.0 for p in people if p.get("nom")}
+    for d in depenses:
+        total = float(d.get("prix_depense", 0.0) or 0.0)
+        alcool_part = float(d.get("alcool_prix", 0.0) or 0.0) if d.get("alcool_boolean") else 0.0
+        viande_part = float(d.get("nourriture_prix", 0.0) or 0.0) if d.get("nourriture_boolean") else 0.0
+        base_part = total - alcool_part - viande_part
+        if base_part < 0:
+            base_part = 0.0
+
+        nb_all = max(len(dues), 1)
+        base_share = base_part / nb_all
+        for name in dues:
+            dues[name] += base_share
+
+        # Répartition alcool pondérée (🍷)
+        drinkers = [p for p in people if p.get("alcool_boolean")]
+        w_sum_a = safe_sum([(p.get("alcool_classification") or 0) for p in drinkers])
+        if alcool_part > 0:
+            if drinkers and w_sum_a > 0:
+                for p in drinkers:
+                    w = p.get("alcool_classification") or 0
+                    dues[p["nom"]] += alcool_part * (w / w_sum_a)
+            else:
+                for n in dues:
+                    dues[n] += alcool_part / nb_all
+
+        # Répartition viande pondérée (🍖)
+        eaters = [p for p in people if p.get("nourriture_boolean")]
+        w_sum_f = safe_sum([(p.get("nourriture_classification") or 0) for p in eaters])
+        if viande_part > 0:
+            if eaters and w_sum_f > 0:
+                for p in eaters:
+                    w = p.get("nourriture_classification") or 0
+                    dues[p["nom"]] += viande_part * (w / w_sum_f)
+            else:
+                for n in dues:
+                    dues[n] += viande_part / nb_all
+
+    return {k: round(v, 2) for k, v in dues.items()}
+
+
+# ------------------ Moteur vectorisé (NumPy) ------------------
+def _num(x):
+    return float(x) if isinstance(x, (int, float)) else 0.0
+
+
+def split_parts(d):
+    """(base, alcool, viande) réparties pour une dépense, comme dans compute_weighted_shares."""
+    total = float(d.get("prix_depense", 0.0) or 0.0)
+    alcool = float(d.get("alcool_prix", 0.0) or 0.0) if d.get("alcool_boolean") else 0.0
+    viande = float(d.get("nourriture_prix", 0.0) or 0.0) if d.get("nourriture_boolean") else 0.0
+    return max(total - alcool - viande, 0.0), max(alcool, 0.0), max(viande, 0.0)
+
+
+def price_matrix(depenses):
+    """Matrice (n_depenses x 3) des montants base / alcool / viande de chaque dépense.
+
+    Mêmes règles que compute_weighted_shares : une catégorie non cochée vaut 0,
+    une part négative n'est pas répartie et la base est bornée à 0.
+    `depenses` peut être un DepenseColumns (cf. storage.load_columns) : la
+    matrice est alors tirée des colonnes, sans repasser par les dicts.
+    """
+    if isinstance(depenses, DepenseColumns):
+        return depenses.price_matrix()
+    n = len(depenses)
+    total = np.fromiter((float(d.get("prix_depense", 0.0) or 0.0) for d in depenses), dtype=np.float64, count=n)
+    alcool = np.fromiter(
+        (float(d.get("alcool_prix", 0.0) or 0.0) if d.get("alcool_boolean") else 0.0 for d in depenses),
+        dtype=np.float64, count=n,
+    )
+    viande = np.fromiter(
+        (float(d.get("nourriture_prix", 0.0) or 0.0) if d.get("nourriture_boolean") else 0.0 for d in depenses),
+        dtype=np.float64, count=n,
+    )
+    base = np.maximum(total - alcool - viande, 0.0)
+    return np.column_stack((base, np.maximum(alcool, 0.0), np.maximum(viande, 0.0)))
+
+
+def weight_matrix(people):
+    """Matrice (3 x n_noms) : fraction de chaque catégorie attribuée à chaque nom.
+
+    Retourne (noms, W). Chaque ligne somme à 1 ; une catégorie sans pondération
+    valide (personne ne consomme ou notes nulles) est répartie à parts égales.
+    """
+    names = list(dict.fromkeys(p["nom"] for p in people if p.get("nom")))
+    index = {n: i for i, n in enumerate(names)}
+    nb_all = max(len(names), 1)
+
+    W = np.zeros((len(CATEGORIES), len(names)), dtype=np.float64)
+    W[0, :] = 1.0 / nb_all
+    for row, flag, key in ((1, "alcool_boolean", "alcool_classification"),
+                           (2, "nourriture_boolean", "nourriture_classification")):
+        consumers = [p for p in people if p.get(flag)]
+        w_sum = safe_sum([(p.get(key) or 0) for p in consumers])
+        if consumers and w_sum > 0:
+            for p in consumers:
+                i = index.get(p.get("nom"))
+                if i is not None:
+                    W[row, i] += _num(p.get(key) or 0) / w_sum
+        else:
+            W[row, :] = 1.0 / nb_all
+    return names, W
+
+
+@instrument()
+def dues_from_totals(people, category_totals):
+    """Parts dues à partir des totaux (base, alcool, viande) déjà répartissables."""
+    if not people:
+        return {}
+    names, W = weight_matrix(people)
+    dues = np.asarray(category_totals, dtype=np.float64) @ W
+    return {n: round(float(v), 2) for n, v in zip(names, dues)}
+
+
+@instrument()
+def compute_weighted_shares_np(people, depenses, prices=None):
+    """Version vectorisée de compute_weighted_shares, à 0,01 € près par personne.
+
+    Les pondérations ne dépendent pas de la dépense : les parts dues se
+    réduisent au produit des totaux par catégorie par la matrice de poids.
+    Les sommes flottantes ne sont pas faites dans le même ordre que dans la
+    boucle de référence : une part proche d'un demi-centime peut être arrondie
+    de l'autre côté (cf. bench.py check).
+    `prices` permet de fournir une matrice déjà construite (cf. price_matrix).
+    """
+    if not people:
+        return {}
+    if prices is None:
+        prices = price_matrix(depenses)
+    return dues_from_totals(people, prices.sum(axis=0) if len(prices) else np.zeros(len(CATEGORIES)))
@@ -0,0 +1,87 @@
+# exporter.py
+import csv
+import gzip
+import io
+import json
+from dataclasses import fields
+from functools import lru_cache
+
+from models import Depense
+
+FORMATS = ("json", "csv", "parquet")
+DEPENSE_COLUMNS = ["id"] + [f.name for f in fields(Depense)]
+MIME = {"json": "application/json", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def iter_json(people, depenses):
+    """Document {"people": [...], "depenses": [...]} produit morceau par morceau (un item par ligne)."""
+    for i, (key, items) in enumerate((("people", people), ("depenses", depenses))):
+        yield ("{" if i == 0 else ",\n") + f'"{key}": ['
+        for j, item in enumerate(items):
+            yield ("\n" if j == 0 else ",\n") + json.dumps(item, ensure_ascii=False, default=str)
+        yield "\n]"
+    yield "}\n"
+
+
+def iter_csv(items, columns=DEPENSE_COLUMNS, batch=1000):
+    """CSV produit par paquets de `batch` lignes."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for i, item in enumerate(items, start=1):
+        writer.writerow(item)
+        if i % batch == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+@lru_cache(maxsize=1)
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def to_parquet(items, columns=DEPENSE_COLUMNS):
+    """Parquet (nécessite pyarrow)."""
+    import pandas as pd
+
+    df = pd.DataFrame(list(items), columns=columns)
+    for c in columns:
+        if c.startswith("date_"):
+            df[c] = pd.to_datetime(df[c], errors="coerce").dt.date
+    out = io.BytesIO()
+    df.to_parquet(out, index=False)
+    return out.getvalue()
+
+
+def _gzip(chunks):
+    out = io.BytesIO()
+    with gzip.GzipFile(fileobj=out, mode="wb", mtime=0) as gz:
+        for chunk in chunks:
+            gz.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    return out.getvalue()
+
+
+def build_export(people, depenses, fmt="json", compress=False, basename="export"):
+    """(contenu, nom de fichier, type MIME) de l'export, calculé seulement à la demande.
+
+    JSON : participants + dépenses ; CSV / Parquet : dépenses seules.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt}")
+    if fmt == "json":
+        chunks = iter_json(people, depenses)
+    elif fmt == "csv":
+        chunks = iter_csv(depenses)
+    else:
+        chunks = [to_parquet(depenses)]
+    filename = f"{basename}.{fmt}"
+    if compress:
+        return _gzip(chunks), filename + ".gz", "application/gzip"
+    data = b"".join(c.encode("utf-8") if isinstance(c, str) else c for c in chunks)
+    return data, filename, MIME[fmt]
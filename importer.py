@@ -0,0 +1,273 @@
+# importer.py
+import codecs
+import csv
+import io
+import math
+import unicodedata
+from functools import lru_cache
+from uuid import uuid4
+
+from date_index import to_date
+from jsonstream import JsonReader
+
+CHUNK_SIZE = 5000  # lignes validées par lot
+MAX_REJECTED = 1000  # lignes rejetées gardées pour le rapport (les autres sont seulement comptées)
+
+# En-têtes reconnus (normalisés) -> champ de Depense
+ALIASES = {
+    "nom": "nom", "libelle": "nom", "description": "nom", "label": "nom", "intitule": "nom",
+    "prix_depense": "prix_depense", "prix": "prix_depense", "montant": "prix_depense", "amount": "prix_depense",
+    "total": "prix_depense", "debit": "prix_depense",
+    "alcool_boolean": "alcool_boolean", "alcool": "alcool_boolean",
+    "alcool_prix": "alcool_prix", "prix_alcool": "alcool_prix",
+    "nourriture_boolean": "nourriture_boolean", "viande": "nourriture_boolean",
+    "nourriture_prix": "nourriture_prix", "prix_viande": "nourriture_prix",
+    "date_depense": "date_depense", "date": "date_depense", "date_operation": "date_depense",
+    "payeur_nom": "payeur_nom", "payeur": "payeur_nom", "paye_par": "payeur_nom",
+    "credit": "credit",
+}
+TRUE_VALUES = {"1", "true", "vrai", "oui", "yes", "x", "o", "y"}
+FALSE_VALUES = {"", "0", "false", "faux", "non", "no", "n"}
+
+
+@lru_cache(maxsize=4096)
+def _norm(s):
+    """Minuscules, sans accents ni espaces superflus (en-têtes et payeurs se répètent : mémoïsé)."""
+    s = unicodedata.normalize("NFKD", str(s)).encode("ascii", "ignore").decode("ascii")
+    return "_".join(s.strip().lower().replace("-", " ").split())
+
+
+def _amount(v):
+    """'12,50' / '1 234.5' / '-8.00' -> float signé (les débits bancaires sont négatifs).
+
+    Lève ValueError pour une valeur non finie ('nan', 'inf').
+    """
+    if v is None or v == "":
+        return 0.0
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        x = float(v)
+    else:
+        s = str(v).replace("\u00a0", "").replace(" ", "").replace("€", "")
+        if "," in s and "." in s:
+            s = s.replace(".", "").replace(",", ".") if s.rfind(",") > s.rfind(".") else s.replace(",", "")
+        else:
+            s = s.replace(",", ".")
+        x = float(s)
+    if not math.isfinite(x):
+        raise ValueError(f"montant invalide : {v!r}")
+    return x
+
+
+def _flag(v):
+    if isinstance(v, bool):
+        return v
+    s = _norm(str(v) if v is not None else "")
+    if s in TRUE_VALUES:
+        return True
+    if s in FALSE_VALUES:
+        return False
+    raise ValueError(f"booléen invalide : {v!r}")
+
+
+def _date(v):
+    """ISO ('2024-03-01') ou format bancaire français ('01/03/2024', '01/03/24' -> 2024)."""
+    dd = to_date(v.strip() if isinstance(v, str) else v)
+    if dd is None and isinstance(v, str) and v.count("/") == 2:
+        day, month, year = v.strip().split("/")
+        year = int(year) + (2000 if len(year.strip()) <= 2 else 0)
+        dd = to_date(f"{year:04d}-{int(month):02d}-{int(day):02d}")
+    if dd is None:
+        raise ValueError(f"date invalide : {v!r}")
+    return str(dd)
+
+
+def validate_row(raw, payers, default_payer=None):
+    """Ligne brute (clés quelconques) -> dict Depense prêt à stocker. Lève ValueError si invalide.
+
+    Mêmes règles que le formulaire « add_depense » : montants positifs,
+    alcool + viande ≤ total, payeur parmi les participants.
+    """
+    return _parse_row(raw, payers, default_payer)[0]
+
+
+def _parse_row(raw, payers, default_payer=None):
+    """(dépense, signe du montant brut) ; cf. validate_row."""
+    row = {}
+    for k, v in raw.items():
+        field = ALIASES.get(_norm(str(k)))
+        if field and field not in row:
+            row[field] = v
+
+    signed = _amount(row.get("prix_depense"))
+    if _amount(row.get("credit")) and not signed:
+        raise ValueError("crédit (remboursement ou virement reçu)")
+    prix = abs(signed)
+    alcool_prix = abs(_amount(row.get("alcool_prix")))
+    nourriture_prix = abs(_amount(row.get("nourriture_prix")))
+    # Sans colonne booléenne, un montant renseigné suffit
+    alcool = _flag(row["alcool_boolean"]) if "alcool_boolean" in row else alcool_prix > 0
+    viande = _flag(row["nourriture_boolean"]) if "nourriture_boolean" in row else nourriture_prix > 0
+    if alcool_prix + nourriture_prix > prix:
+        raise ValueError("La somme alcool + viande dépasse le prix total.")
+    if "date_depense" not in row:
+        raise ValueError("date manquante")
+
+    payer_raw = str(row.get("payeur_nom") or "").strip()
+    if payer_raw:
+        payer = payers.get(_norm(payer_raw))
+        if payer is None:
+            raise ValueError(f"payeur inconnu : {payer_raw!r}")
+    elif default_payer:
+        payer = default_payer
+    else:
+        raise ValueError("payeur manquant")
+
+    return {
+        "nom": str(row.get("nom") or "").strip(),
+        "prix_depense": prix,
+        "alcool_boolean": alcool,
+        "alcool_prix": alcool_prix,
+        "nourriture_boolean": viande,
+        "nourriture_prix": nourriture_prix,
+        "date_depense": _date(row["date_depense"]),
+        "payeur_nom": payer,
+        "id": str(uuid4()),
+    }, (signed > 0) - (signed < 0)
+
+
+def _cp1252_fallback(e):
+    """Gestionnaire d'erreurs de décodage : octets non UTF-8 lus en Windows-1252."""
+    return e.object[e.start:e.end].decode("cp1252", errors="replace"), e.end
+
+
+codecs.register_error("cp1252_fallback", _cp1252_fallback)
+
+
+def _text_stream(binary):
+    """Flux texte UTF-8 (BOM accepté), ou Windows-1252 si le début du fichier n'est pas de l'UTF-8.
+
+    Seuls les 64 premiers Kio sont examinés : un octet Windows-1252 plus loin
+    dans un fichier UTF-8 est décodé en Windows-1252 plutôt que d'interrompre
+    l'import.
+    """
+    head = binary.read(65536)
+    binary.seek(0)
+    try:
+        head.decode("utf-8")
+        encoding, errors = "utf-8-sig", "cp1252_fallback"
+    except UnicodeDecodeError as e:
+        # Un caractère multi-octets coupé en fin de bloc n'est pas une erreur
+        if e.start >= len(head) - 3:
+            encoding, errors = "utf-8-sig", "cp1252_fallback"
+        else:
+            encoding, errors = "cp1252", "replace"
+    return io.TextIOWrapper(binary, encoding=encoding, errors=errors, newline="")
+
+
+def iter_csv(text):
+    """Lignes d'un CSV (séparateur ',', ';' ou tabulation détecté), numérotées à partir de 2."""
+    sample = text.read(65536)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    for i, row in enumerate(csv.DictReader(text, dialect=dialect), start=2):
+        yield i, row
+
+
+def iter_json(text, block_size=1 << 16):
+    """Objets d'un tableau JSON ou d'un fichier JSON Lines, lus bloc par bloc.
+
+    Un document {"depenses": [...]} (export de l'app) est aussi accepté,
+    mais chargé en une fois.
+    """
+    reader = JsonReader(text, block_size)
+    n = 0
+    # Espaces, virgules et crochets sautés entre deux objets (tableau ou JSON Lines)
+    while reader.skip(" \t\r\n,[]"):
+        try:
+            obj = reader.value()
+        except ValueError:
+            raise ValueError(f"JSON invalide près de l'objet n°{n + 1}") from None
+        if isinstance(obj, dict) and isinstance(obj.get("depenses"), list):
+            for item in obj["depenses"]:
+                n += 1
+                yield n, item
+        elif isinstance(obj, dict):
+            n += 1
+            yield n, obj
+
+
+def import_depenses(binary, people, fmt=None, filename="", default_payer=None, chunk_size=CHUNK_SIZE):
+    """Importe un fichier CSV / JSON / JSONL de dépenses en flux.
+
+    Renvoie (dépenses valides, rapport). Le rapport contient le nombre de
+    lignes lues, importées et rejetées, et le détail (numéro, motif) des
+    MAX_REJECTED premières lignes rejetées. Un fichier illisible au-delà d'un
+    point (JSON invalide, CSV mal formé) n'annule pas l'import : les lignes lues
+    avant sont gardées et le rapport contient "erreur". L'écriture est laissée à
+    l'appelant, en un seul lot (cf. storage.record_add_many).
+
+    Un fichier contenant des montants négatifs est un relevé bancaire signé :
+    seuls les débits (négatifs) sont importés, les montants positifs (crédits :
+    remboursements, virements reçus) sont rejetés.
+    """
+    fmt = fmt or ("csv" if filename.lower().endswith(".csv") else "json")
+    payers = {}
+    for p in people:
+        nom = (p.get("nom") or "").strip()
+        if nom:
+            payers.setdefault(_norm(nom), nom)
+    if default_payer is None and len(payers) == 1:
+        default_payer = next(iter(payers.values()))
+
+    text = _text_stream(binary)
+    rows = iter_csv(text) if fmt == "csv" else iter_json(text)
+    items, rejected = [], []
+    positives = []  # (ligne, indice dans items) des montants positifs
+    has_debits = False
+    report = {"lues": 0, "importees": 0, "rejetees": 0}
+    chunk = []
+
+    def reject(line, reason):
+        report["rejetees"] += 1
+        if len(rejected) < MAX_REJECTED:
+            rejected.append((line, reason))
+
+    def flush():
+        nonlocal has_debits
+        for line, raw in chunk:
+            try:
+                if not isinstance(raw, dict):
+                    raise ValueError("ligne qui n'est pas un objet")
+                item, sign = _parse_row(raw, payers, default_payer)
+            except (ValueError, TypeError) as e:
+                reject(line, str(e))
+                continue
+            if sign > 0:
+                positives.append((line, len(items)))
+            elif sign < 0:
+                has_debits = True
+            items.append(item)
+        chunk.clear()
+
+    try:
+        for line, raw in rows:
+            report["lues"] += 1
+            chunk.append((line, raw))
+            if len(chunk) >= chunk_size:
+                flush()
+    except (ValueError, csv.Error) as e:
+        report["erreur"] = f"lecture interrompue après {report['lues']} ligne(s) : {e}"
+    flush()
+    if has_debits and positives:
+        dropped = set()
+        for line, i in positives:
+            dropped.add(i)
+            reject(line, "crédit dans un relevé bancaire (remboursement ou virement reçu)")
+        items = [it for i, it in enumerate(items) if i not in dropped]
+        rejected.sort()
+    report["importees"] = len(items)
+    report["detail_rejets"] = rejected
+    return items, report
@@ -0,0 +1,173 @@
+# instrumentation.py
+"""Mesure du temps (et des allocations) des sections chaudes d'un rerun.
+
+Désactivé par défaut : les fonctions décorées par @instrument ne sont alors
+pas enveloppées (aucun surcoût). Activation par variables d'environnement :
+
+    INSTRUMENT=1            temps par section, panneau admin dans la barre latérale
+    INSTRUMENT_ALLOC=1      avec suivi des allocations (tracemalloc, ralentit nettement le rerun)
+    METRICS_FILE=metrics.prom   export texte au format Prometheus après chaque rerun
+"""
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("INSTRUMENT") == "1"
+TRACE_ALLOC = ENABLED and os.environ.get("INSTRUMENT_ALLOC") == "1"
+METRICS_FILE = os.environ.get("METRICS_FILE") or None
+METRIC_PREFIX = "depenses_app"
+
+# Rerun en cours, par thread (Streamlit exécute chaque session dans son propre thread)
+_local = threading.local()
+# Cumuls depuis le démarrage du serveur, toutes sessions confondues
+_lock = threading.Lock()
+_totals = defaultdict(lambda: [0, 0.0, 0])  # section -> [appels, secondes, octets alloués]
+_reruns = [0, 0.0]  # [nombre, secondes]
+_last = {}  # dernier rerun : {"seconds", "peak_bytes", "sizes"}
+
+
+def _alloc():
+    return tracemalloc.get_traced_memory()[0] if TRACE_ALLOC else 0
+
+
+@contextmanager
+def span(name):
+    """Mesure le bloc sous `name` (temps inclusif, octets alloués nets)."""
+    if not ENABLED:
+        yield
+        return
+    a0 = _alloc()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - t0
+        alloc = _alloc() - a0
+        with _lock:
+            tot = _totals[name]
+            tot[0] += 1
+            tot[1] += seconds
+            tot[2] += alloc
+        rerun = getattr(_local, "rerun", None)
+        if rerun is not None:
+            s = rerun.setdefault(name, [0, 0.0, 0])
+            s[0] += 1
+            s[1] += seconds
+            s[2] += alloc
+
+
+def instrument(name=None):
+    """Décorateur : mesure chaque appel sous `name` (nom de la fonction par défaut).
+
+    Sans INSTRUMENT=1, la fonction est renvoyée telle quelle.
+    """
+    def deco(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def start_rerun():
+    """Début d'un rerun : les sections mesurées ensuite lui sont attribuées."""
+    if not ENABLED:
+        return
+    if TRACE_ALLOC:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    _local.rerun = {}
+    _local.t0 = time.perf_counter()
+
+
+def finish_rerun(sizes=None):
+    """Fin du rerun : renvoie le détail par section, trié par temps décroissant.
+
+    sizes() renvoie la taille des données (ex. {"people": 12, "depenses": 3400}),
+    exportée pour suivre la latence en fonction du volume ; elle est appelée
+    hors mesure. Écrit METRICS_FILE si défini.
+    """
+    rerun = getattr(_local, "rerun", None)
+    if not ENABLED or rerun is None:
+        return None
+    seconds = time.perf_counter() - _local.t0
+    _local.rerun = None
+    report = {
+        "seconds": seconds,
+        "peak_bytes": tracemalloc.get_traced_memory()[1] if TRACE_ALLOC else None,
+        "sizes": dict(sizes()) if sizes else {},
+        "spans": sorted(
+            ({"section": k, "appels": n, "ms": s * 1000, "alloc_ko": a / 1024} for k, (n, s, a) in rerun.items()),
+            key=lambda r: r["ms"],
+            reverse=True,
+        ),
+    }
+    with _lock:
+        _reruns[0] += 1
+        _reruns[1] += seconds
+        _last.update(seconds=seconds, peak_bytes=report["peak_bytes"], sizes=report["sizes"])
+    if METRICS_FILE:
+        write_prometheus(METRICS_FILE)
+    return report
+
+
+def prometheus_text():
+    """Cumuls au format d'exposition texte de Prometheus."""
+    p = METRIC_PREFIX
+    with _lock:
+        totals = {k: list(v) for k, v in _totals.items()}
+        reruns = list(_reruns)
+        last = dict(_last)
+    lines = [
+        f"# HELP {p}_reruns_total Reruns mesurés.",
+        f"# TYPE {p}_reruns_total counter",
+        f"{p}_reruns_total {reruns[0]}",
+        f"# HELP {p}_rerun_seconds_total Durée cumulée des reruns.",
+        f"# TYPE {p}_rerun_seconds_total counter",
+        f"{p}_rerun_seconds_total {reruns[1]:.6f}",
+    ]
+    if last:
+        lines += [
+            f"# HELP {p}_last_rerun_seconds Durée du dernier rerun.",
+            f"# TYPE {p}_last_rerun_seconds gauge",
+            f"{p}_last_rerun_seconds {last['seconds']:.6f}",
+        ]
+        if last["peak_bytes"] is not None:
+            lines += [
+                f"# HELP {p}_last_rerun_peak_bytes Pic mémoire Python du dernier rerun (tracemalloc).",
+                f"# TYPE {p}_last_rerun_peak_bytes gauge",
+                f"{p}_last_rerun_peak_bytes {last['peak_bytes']}",
+            ]
+        lines += [
+            f"# HELP {p}_dataset_items Taille des données du dernier rerun.",
+            f"# TYPE {p}_dataset_items gauge",
+        ] + [f'{p}_dataset_items{{kind="{k}"}} {v}' for k, v in sorted(last["sizes"].items())]
+    # Allocations nettes : peuvent diminuer (libérations), d'où une jauge
+    for metric, idx, kind, help_, fmt in (
+        ("span_calls_total", 0, "counter", "Appels par section instrumentée.", "{}"),
+        ("span_seconds_total", 1, "counter", "Temps cumulé (inclusif) par section.", "{:.6f}"),
+        ("span_alloc_bytes", 2, "gauge", "Octets alloués nets cumulés par section (tracemalloc).", "{}"),
+    ):
+        if idx == 2 and not TRACE_ALLOC:
+            continue
+        lines += [f"# HELP {p}_{metric} {help_}", f"# TYPE {p}_{metric} {kind}"]
+        lines += [f'{p}_{metric}{{section="{k}"}} ' + fmt.format(v[idx]) for k, v in sorted(totals.items())]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Écrit prometheus_text() dans `path` (remplacement atomique, lisible par node_exporter)."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
@@ -0,0 +1,91 @@
+# jsonstream.py
+import json
+
+_NUMBER_CHARS = "0123456789+-.eE"  # caractères possibles d'un nombre JSON
+
+
+class JsonReader:
+    """Lecture en flux d'un texte JSON, valeur par valeur, sans le charger en entier.
+
+    Utilisé par importer.iter_json (objets d'un tableau ou d'un fichier JSON
+    Lines) et par migrate.py (tableaux d'un document {"clé": valeur, ...}).
+    """
+
+    def __init__(self, text, block_size=1 << 16):
+        self.text = text
+        self.block_size = block_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        chunk = self.text.read(size or self.block_size)
+        self.eof = not chunk
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def skip(self, chars=" \t\r\n"):
+        """Saute les caractères `chars` ; renvoie le caractère suivant ("" en fin de texte)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in chars:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+
+    def peek(self):
+        """Prochain caractère significatif ("" en fin de texte)."""
+        return self.skip()
+
+    def expect(self, chars):
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"JSON invalide : {chars!r} attendu, {c!r} trouvé")
+        self.pos += 1
+        return c
+
+    def value(self):
+        """Valeur JSON suivante ; ValueError si elle est invalide ou tronquée."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Lecture doublée à chaque échec : une grosse valeur ne coûte pas O(n²)
+                if self.eof or not self._fill(max(self.block_size, len(self.buf) - self.pos)):
+                    raise ValueError("JSON invalide ou tronqué")
+                continue
+            if not self.eof and len(self.buf) - end <= 32 and not self.buf[end:].strip(_NUMBER_CHARS):
+                # Rien après la valeur qu'un début de nombre ('1', '1.', '1e') : elle
+                # peut continuer dans le bloc suivant ('1234' puis '56789')
+                self._fill()
+                continue
+            self.pos = end
+            return obj
+
+    def items(self):
+        """Items du tableau courant (le '[' a été consommé)."""
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+    def entries(self):
+        """(clé, valeur) du document ; pour un tableau, valeur est un itérateur à consommer aussitôt."""
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if self.peek() == "[":
+                self.pos += 1
+                yield key, self.items()
+            else:
+                yield key, self.value()
+            if self.expect(",}") == "}":
+                return
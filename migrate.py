@@ -0,0 +1,106 @@
+# migrate.py
+"""Mise à jour unique des fichiers de données au format storage.SCHEMA_VERSION.
+
+    python migrate.py                    # storage.json + tous les groupes
+    python migrate.py workspaces/ete.json
+    python migrate.py --check            # code de sortie 1 si une migration est nécessaire
+
+Le fichier est lu et réécrit en flux (un item à la fois), sous le verrou
+d'écriture de storage.py, puis remplacé atomiquement. Les ids créés sont donc
+écrits une fois pour toutes et le chargement suivant prend le chemin rapide.
+"""
+import argparse
+import json
+import os
+import sys
+
+import storage
+from jsonstream import JsonReader
+from storage import SCHEMA_VERSION, file_lock, journal_paths, migrate_depense, migrate_person
+from workspaces import list_workspaces, workspace_path
+
+MIGRATORS = {"people": migrate_person, "depenses": migrate_depense}
+
+
+def migrate_file(path, write=True):
+    """Migre `path` ; renvoie un rapport {"schema", "migres", "items", "ecrit"}.
+
+    Un fichier déjà au format courant est reconnu dès sa première clé (écrite
+    en tête par storage._write_snapshot et par cette fonction) et n'est pas réécrit.
+    """
+    report = {"schema": None, "migres": 0, "items": 0, "ecrit": False}
+    if write and any(os.path.exists(j) for j in journal_paths(path)):
+        # Le journal est d'abord replié : la compaction écrit un fichier au format courant
+        storage.compact(path)
+    with file_lock(path):
+        tmp = f"{path}.{os.getpid()}.migrate.tmp"
+        extra = {}
+        with open(path, "r", encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as out:
+            # Format en tête : les prochains passages s'arrêtent à la première clé
+            out.write(f'{{\n"schema_version": {SCHEMA_VERSION}')
+            sep = ",\n"
+            for key, value in JsonReader(src).entries():
+                if key == "schema_version":
+                    report["schema"] = value
+                    if value >= SCHEMA_VERSION and report["items"] == 0:
+                        break  # déjà à jour
+                elif key in MIGRATORS:
+                    migrate = MIGRATORS[key]
+                    out.write(f'{sep}"{key}": [')
+                    sep = ",\n"
+                    first = True
+                    for item in value:
+                        report["items"] += 1
+                        if isinstance(item, dict) and migrate(item):
+                            report["migres"] += 1
+                        out.write(("\n" if first else ",\n") + json.dumps(item, ensure_ascii=False, default=str))
+                        first = False
+                    out.write("\n]")
+                else:
+                    extra[key] = value
+            else:
+                extra["version"] = extra.get("version", 0) + 1
+                for key, value in extra.items():
+                    out.write(f"{sep}{json.dumps(key)}: {json.dumps(value, ensure_ascii=False, default=str)}")
+                    sep = ",\n"
+                out.write("\n}\n")
+                out.flush()
+                os.fsync(out.fileno())
+        if report["schema"] is None:
+            report["schema"] = 1
+        if not write or report["schema"] >= SCHEMA_VERSION:
+            os.remove(tmp)
+            return report
+        os.replace(tmp, path)
+        report["ecrit"] = True
+    storage.invalidate_cache(path)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="fichiers à migrer (défaut : storage.json et tous les groupes)")
+    parser.add_argument("--check", action="store_true", help="ne rien écrire ; code 1 si une migration est nécessaire")
+    args = parser.parse_args(argv)
+
+    paths = args.files or [workspace_path(w) for w in list_workspaces()]
+    pending = False
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"{path} : absent, ignoré")
+            continue
+        report = migrate_file(path, write=not args.check)
+        if report["schema"] >= SCHEMA_VERSION:
+            print(f"{path} : déjà au format {SCHEMA_VERSION}")
+        elif args.check:
+            pending = True
+            print(f"{path} : format {report['schema']}, {report['migres']}/{report['items']} item(s) à migrer")
+        else:
+            print(f"{path} : format {report['schema']} -> {SCHEMA_VERSION}, "
+                  f"{report['migres']}/{report['items']} item(s) migré(s)")
+    if pending:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     nom: str
     alcool_boolean: bool
@@ -12,7 +12,7 @@ class Person:
     date_arrive: datetime.date
     date_depart: datetime.date
 
-@dataclass
+@dataclass(slots=True)
 class Depense:
     nom: str
     prix_depense: float
@@ -0,0 +1,20 @@
+# pagination.py
+import math
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def search_items(items, query, fields):
+    """Items dont l'un des champs contient `query` (insensible à la casse)."""
+    q = (query or "").strip().lower()
+    if not q:
+        return items
+    return [x for x in items if any(q in str(x.get(f) or "").lower() for f in fields)]
+
+
+def paginate(items, page, page_size):
+    """(items de la page, nombre de pages) ; `page` commence à 1 et est borné."""
+    n_pages = max(1, math.ceil(len(items) / page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], n_pages
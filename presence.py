@@ -0,0 +1,119 @@
+# presence.py
+import numpy as np
+
+from columnar import NO_DAY, DepenseColumns
+from date_index import DateIndex, to_date
+from instrumentation import instrument
+
+# Bornes pour une date d'arrivée / de départ manquante (présence non bornée)
+_NO_START = np.iinfo(np.int64).min
+_NO_END = np.iinfo(np.int64).max - 1
+
+
+def _interval(p):
+    """(arrivée, départ) en numéros de jour, bornes incluses."""
+    a = to_date(p.get("date_arrive"))
+    d = to_date(p.get("date_depart"))
+    a = a.toordinal() if a else _NO_START
+    d = d.toordinal() if d else _NO_END
+    return (d, a) if a > d else (a, d)
+
+
+class _Roster:
+    """Participants nommés, agrégés par nom, avec leurs pondérations."""
+
+    def __init__(self, people):
+        named = [p for p in people if p.get("nom")]
+        self.names = list(dict.fromkeys(p["nom"] for p in named))
+        index = {n: i for i, n in enumerate(self.names)}
+        self.name_idx = np.array([index[p["nom"]] for p in named], dtype=np.int64)
+        iv = [_interval(p) for p in named]
+        self.arrive = np.array([a for a, _ in iv], dtype=np.int64)
+        self.depart = np.array([d for _, d in iv], dtype=np.int64)
+        self.weights = []
+        for flag, key in (("alcool_boolean", "alcool_classification"),
+                          ("nourriture_boolean", "nourriture_classification")):
+            w = [p.get(key) or 0 for p in named]
+            w = [float(x) if isinstance(x, (int, float)) else 0.0 for x in w]
+            self.weights.append((np.array([bool(p.get(flag)) for p in named], dtype=bool), np.array(w)))
+
+    def weight_matrix(self, present):
+        """Matrice (3 x n_noms) de répartition entre les personnes présentes (masque par personne)."""
+        n = len(self.names)
+        if not present.any():
+            # Personne n'est présent ce jour-là : on répartit sur tout le monde
+            present = np.ones(len(self.name_idx), dtype=bool)
+        present_names = np.zeros(n, dtype=bool)
+        present_names[self.name_idx[present]] = True
+        equal = present_names / present_names.sum()
+
+        W = np.empty((3, n), dtype=np.float64)
+        W[0] = equal
+        for row, (flags, w) in enumerate(self.weights, start=1):
+            wp = np.where(flags & present, w, 0.0)
+            w_sum = wp.sum()
+            if (flags & present).any() and w_sum > 0:
+                W[row] = np.bincount(self.name_idx, weights=wp, minlength=n) / w_sum
+            else:
+                W[row] = equal
+        return W
+
+
+@instrument()
+def compute_presence_shares(people, depenses, columns=None):
+    """Parts dues en ne répartissant chaque dépense qu'entre les présents à sa date.
+
+    Balayage chronologique : les dépenses sont triées par date et l'ensemble
+    des présents ne change qu'aux arrivées/départs. Entre deux événements, les
+    dépenses sont sommées par sommes préfixes et réparties en un seul produit
+    matriciel. Coût O((D + P) log(D + P) + S·P) avec S le nombre de périodes
+    contenant au moins une dépense, au lieu de O(D·P).
+
+    Une personne sans date d'arrivée (ou de départ) est présente depuis
+    toujours (ou jusqu'au bout). Une dépense sans date, ou un jour où personne
+    n'est présent, est répartie sur tout le monde comme dans
+    compute_weighted_shares. `columns` : DepenseColumns des mêmes dépenses
+    (cf. storage.load_columns), sinon construit ici.
+    """
+    if not people:
+        return {}
+    roster = _Roster(people)
+    n = len(roster.names)
+    if not n:
+        return {}
+    dues = np.zeros(n, dtype=np.float64)
+    everyone = np.ones(len(roster.name_idx), dtype=bool)
+
+    cols = columns if columns is not None else DepenseColumns(depenses)
+    index = DateIndex(depenses, cols)
+    undated = cols.day == NO_DAY
+    if undated.any():
+        dues += cols.price_matrix()[undated].sum(axis=0) @ roster.weight_matrix(everyone)
+
+    if index.items:
+        ords = index.ordinals
+        prefix = np.zeros((len(ords) + 1, 3), dtype=np.float64)
+        np.cumsum(index.split, axis=0, out=prefix[1:])
+
+        # Événements : arrivée le jour a, départ effectif le lendemain du jour d
+        arr_order = np.argsort(roster.arrive, kind="stable")
+        dep_order = np.argsort(roster.depart, kind="stable")
+        cuts = np.unique(np.concatenate((roster.arrive, roster.depart + 1)))
+        cuts = cuts[(cuts > ords[0]) & (cuts <= ords[-1])]
+        bounds = np.concatenate(([0], np.searchsorted(ords, cuts, side="left"), [len(ords)]))
+        starts = np.concatenate((ords[:1], cuts))
+
+        present = np.zeros(len(roster.name_idx), dtype=bool)
+        ia = idp = 0
+        for lo, hi, day in zip(bounds[:-1], bounds[1:], starts):
+            # Avance le balayage jusqu'au jour `day`
+            while ia < len(arr_order) and roster.arrive[arr_order[ia]] <= day:
+                present[arr_order[ia]] = True
+                ia += 1
+            while idp < len(dep_order) and roster.depart[dep_order[idp]] < day:
+                present[dep_order[idp]] = False
+                idp += 1
+            if hi > lo:
+                dues += (prefix[hi] - prefix[lo]) @ roster.weight_matrix(present)
+
+    return {name: round(float(v), 2) for name, v in zip(roster.names, dues)}
@@ -0,0 +1,114 @@
+# scenarios.py
+import numpy as np
+
+from columnar import PeopleColumns
+from instrumentation import instrument
+
+# Scénarios aléatoires évalués par lot (borne la mémoire : lot x personnes x 2)
+BATCH_SIZE = 2000
+MAX_SCENARIOS = 10_000
+RATING_MIN, RATING_MAX = 1, 10  # bornes des notes du formulaire Participants
+
+
+def person_arrays(people):
+    """(noms, owner, flags, ratings) pour les calculs par lot.
+
+    owner[i] : indice du nom de la personne i (-1 sans nom) ; flags et ratings
+    (n_personnes x 2) : consommation et note (alcool, viande). `people` : liste
+    de dicts ou PeopleColumns (cf. storage.load_columns).
+    """
+    cols = people if isinstance(people, PeopleColumns) else PeopleColumns(people)
+    names = list(dict.fromkeys(n for n in cols.noms if n))
+    index = {n: i for i, n in enumerate(names)}
+    owner = np.array([index[n] if n else -1 for n in cols.noms], dtype=np.int64)
+    flags = np.column_stack((cols.alcool, cols.viande)).reshape(len(cols), 2)
+    ratings = np.column_stack((cols.alcool_note, cols.viande_note)).reshape(len(cols), 2)
+    return names, owner, flags, ratings
+
+
+def batch_dues(n_names, owner, category_totals, flags, ratings, scale=None):
+    """Parts dues (S x n_noms) de S scénarios d'un coup.
+
+    flags, ratings : (S x n_personnes x 2) ; scale : (S x 3) coefficients
+    appliqués aux totaux (base, alcool, viande). Mêmes règles que
+    engine.weight_matrix : une catégorie sans pondération valide est répartie
+    à parts égales entre tous les noms.
+    """
+    S = flags.shape[0]
+    if n_names == 0:
+        return np.zeros((S, 0))
+    nb_all = max(n_names, 1)
+    named = owner >= 0
+    onehot = np.zeros((len(owner), n_names))
+    onehot[np.flatnonzero(named), owner[named]] = 1.0
+
+    raw = np.where(flags, ratings, 0.0)  # S x p x 2
+    w_sum = raw.sum(axis=1)  # S x 2
+    valid = w_sum > 0
+    per_name = np.swapaxes(raw, 1, 2) @ onehot  # S x 2 x n (produit matriciel BLAS)
+    W = np.where(valid[..., None], per_name / np.where(valid, w_sum, 1.0)[..., None], 1.0 / nb_all)
+
+    totals = np.broadcast_to(np.asarray(category_totals, dtype=np.float64), (S, 3))
+    if scale is not None:
+        totals = totals * scale
+    return totals[:, :1] / nb_all + np.einsum("sc,scn->sn", totals[:, 1:], W)
+
+
+def named_scenarios(flags, ratings):
+    """Scénarios de référence : [(libellé, flags, ratings, scale)]."""
+    none = np.zeros_like(flags)
+    uniform = np.ones_like(ratings)
+    full = np.ones(3)
+    return [
+        ("Actuel", flags, ratings, full),
+        ("Notes identiques", flags, uniform, full),
+        ("Alcool à parts égales", np.column_stack((none[:, 0], flags[:, 1])), ratings, full),
+        ("Viande à parts égales", np.column_stack((flags[:, 0], none[:, 1])), ratings, full),
+        ("Tout à parts égales", none, ratings, full),
+        ("Sans l'alcool", flags, ratings, np.array([1.0, 0.0, 1.0])),
+        ("Sans la viande", flags, ratings, np.array([1.0, 1.0, 0.0])),
+    ]
+
+
+@instrument()
+def run_scenarios(people, category_totals, n_random=1000, sigma=1.5, seed=0):
+    """Évalue les scénarios de référence puis n_random notes perturbées.
+
+    Chaque note (alcool, viande) reçoit un bruit gaussien d'écart-type sigma,
+    arrondie et bornée à [RATING_MIN, RATING_MAX] ; les consommations ne
+    changent pas. Renvoie (noms, libellés des scénarios de référence,
+    parts dues de référence (R x n), parts dues aléatoires (n_random x n)).
+    """
+    names, owner, flags, ratings = person_arrays(people)
+    n_random = min(max(int(n_random), 0), MAX_SCENARIOS)
+
+    ref = named_scenarios(flags, ratings)
+    ref_dues = batch_dues(
+        len(names), owner, category_totals,
+        np.stack([f for _, f, _, _ in ref]), np.stack([r for _, _, r, _ in ref]), np.stack([s for *_, s in ref]),
+    )
+
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, n_random, BATCH_SIZE):
+        size = min(BATCH_SIZE, n_random - start)
+        noisy = np.clip(np.rint(ratings + rng.normal(0.0, sigma, (size,) + ratings.shape)), RATING_MIN, RATING_MAX)
+        chunks.append(batch_dues(len(names), owner, category_totals,
+                                 np.broadcast_to(flags, noisy.shape), noisy))
+    random_dues = np.concatenate(chunks) if chunks else np.zeros((0, len(names)))
+    return names, [label for label, *_ in ref], ref_dues, random_dues
+
+
+def spread(names, current, random_dues):
+    """Dispersion des parts dues par personne sur les scénarios aléatoires (lignes de tableau)."""
+    if not len(random_dues):
+        return []
+    q = np.percentile(random_dues, [0, 5, 50, 95, 100], axis=0)
+    std = random_dues.std(axis=0)
+    return [
+        {"Participant": n, "Actuel (€)": round(float(current[i]), 2),
+         "Min (€)": round(float(q[0, i]), 2), "P5 (€)": round(float(q[1, i]), 2),
+         "Médiane (€)": round(float(q[2, i]), 2), "P95 (€)": round(float(q[3, i]), 2),
+         "Max (€)": round(float(q[4, i]), 2), "Écart-type (€)": round(float(std[i]), 2)}
+        for i, n in enumerate(names)
+    ]
@@ -0,0 +1,150 @@
+# settlement.py
+import heapq
+import random
+import time
+
+from instrumentation import instrument
+
+# Au-delà, la recherche exacte (2^n) devient trop lente ("auto" passe au glouton)
+EXACT_MAX_PEOPLE = 14
+
+
+def to_cents(x):
+    return int(round(float(x or 0.0) * 100))
+
+
+def net_balances(dues, paid_by):
+    """Solde de chacun en centimes : payé - dû (positif = doit recevoir).
+
+    Les parts dues étant arrondies au centime, la somme des soldes peut
+    s'écarter de quelques centimes de zéro : l'écart est réparti, un centime
+    à la fois, sur les plus gros soldes pour que tout s'équilibre exactement.
+    """
+    names = list(dict.fromkeys(list(dues) + list(paid_by)))
+    bal = {n: to_cents(paid_by.get(n, 0.0)) - to_cents(dues.get(n, 0.0)) for n in names}
+    residual = sum(bal.values())
+    if residual and names:
+        order = sorted(names, key=lambda n: -abs(bal[n]))
+        step = -1 if residual > 0 else 1
+        q, r = divmod(abs(residual), len(order))
+        for i, n in enumerate(order):
+            bal[n] += step * (q + (1 if i < r else 0))
+    return bal
+
+
+def _greedy(balances):
+    """Le plus gros débiteur rembourse le plus gros créancier, jusqu'à épuisement."""
+    debtors = [(b, n) for n, b in balances.items() if b < 0]
+    creditors = [(-b, n) for n, b in balances.items() if b > 0]
+    heapq.heapify(debtors)
+    heapq.heapify(creditors)
+    transfers = []
+    while debtors and creditors:
+        d, dn = heapq.heappop(debtors)
+        c, cn = heapq.heappop(creditors)
+        amount = min(-d, -c)
+        transfers.append((dn, cn, amount))
+        if d + amount < 0:
+            heapq.heappush(debtors, (d + amount, dn))
+        if c + amount < 0:
+            heapq.heappush(creditors, (c + amount, cn))
+    return transfers
+
+
+def _exact(balances):
+    """Nombre minimal de virements : n - (nombre max de sous-groupes à somme nulle).
+
+    Chaque sous-groupe à somme nulle de k personnes se règle en k - 1 virements.
+    Programmation dynamique sur les sous-ensembles (O(2^n · n)).
+    """
+    names = [n for n, b in balances.items() if b]
+    vals = [balances[n] for n in names]
+    n = len(names)
+    full = (1 << n) - 1
+    sums = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        sums[mask] = sums[mask ^ low] + vals[low.bit_length() - 1]
+    best = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        m = 0
+        rest = mask
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            m = max(m, best[mask ^ low])
+        best[mask] = m + (1 if sums[mask] == 0 else 0)
+
+    # Reconstruction des sous-groupes à somme nulle
+    groups = []
+    mask = full
+    while mask:
+        sub = mask
+        while sub:
+            # plus petit sous-groupe à somme nulle conservant l'optimum
+            if sums[sub] == 0 and best[mask ^ sub] + 1 == best[mask]:
+                break
+            sub = (sub - 1) & mask
+        if not sub:
+            sub = mask
+        groups.append(sub)
+        mask ^= sub
+
+    transfers = []
+    for g in groups:
+        members = {names[i]: vals[i] for i in range(n) if g >> i & 1}
+        transfers.extend(_greedy(members))
+    return transfers
+
+
+def settle(balances, mode="auto"):
+    """Plan de remboursement [(débiteur, créancier, centimes)].
+
+    mode : "greedy" (rapide, au plus n - 1 virements), "exact" (minimum de
+    virements, petits groupes) ou "auto" (exact si assez peu de soldes non nuls).
+    """
+    if mode not in ("greedy", "auto", "exact"):
+        raise ValueError(f"Mode inconnu : {mode}")
+    nonzero = sum(1 for b in balances.values() if b)
+    if mode == "exact" and nonzero > EXACT_MAX_PEOPLE:
+        raise ValueError(f"Mode exact trop coûteux pour {nonzero} soldes non nuls")
+    if mode == "exact" or (mode == "auto" and nonzero <= EXACT_MAX_PEOPLE):
+        return _exact(balances)
+    return _greedy(balances)
+
+
+@instrument()
+def settlement_plan(dues, paid_by, mode="auto"):
+    """Soldes (€) et virements [(qui paie, à qui, montant €)] pour solder le groupe."""
+    balances = net_balances(dues, paid_by)
+    transfers = settle(balances, mode)
+    return (
+        {n: b / 100 for n, b in balances.items()},
+        [(a, b, cents / 100) for a, b, cents in transfers],
+    )
+
+
+def benchmark(sizes=(10, 100, 500, 1000), repeat=3, seed=0):
+    """Temps (s) du mode glouton pour des groupes de tailles croissantes."""
+    rng = random.Random(seed)
+    results = {}
+    for n in sizes:
+        names = [f"p{i}" for i in range(n)]
+        dues = {name: rng.randint(0, 100_000) / 100 for name in names}
+        total = sum(to_cents(v) for v in dues.values())
+        weights = [rng.random() for _ in names]
+        w_sum = sum(weights)
+        paid_by = {name: total * w / w_sum / 100 for name, w in zip(names, weights)}
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            balances = net_balances(dues, paid_by)
+            transfers = settle(balances, "greedy")
+            best = min(best, time.perf_counter() - t0)
+        results[n] = {"seconds": best, "transfers": len(transfers)}
+    return results
+
+
+if __name__ == "__main__":
+    for n, r in benchmark().items():
+        print(f"{n:>6} personnes : {r['seconds'] * 1000:8.2f} ms, {r['transfers']} virements")
@@ -0,0 +1,182 @@
+# sqlite_store.py
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import fields
+
+from models import Person, Depense
+
+# Tables calquées sur les dataclasses de models.py (+ id)
+TABLES = {
+    "people": ("person", [f.name for f in fields(Person)]),
+    "depenses": ("depense", [f.name for f in fields(Depense)]),
+}
+BOOL_COLUMNS = {"alcool_boolean", "nourriture_boolean"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS person (
+    id TEXT PRIMARY KEY,
+    nom TEXT,
+    alcool_boolean INTEGER,
+    alcool_classification INTEGER,
+    nourriture_boolean INTEGER,
+    nourriture_classification INTEGER,
+    date_arrive TEXT,
+    date_depart TEXT
+);
+CREATE TABLE IF NOT EXISTS depense (
+    id TEXT PRIMARY KEY,
+    nom TEXT,
+    prix_depense REAL,
+    alcool_boolean INTEGER,
+    alcool_prix REAL,
+    nourriture_boolean INTEGER,
+    nourriture_prix REAL,
+    date_depense TEXT,
+    payeur_nom TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_depense_date ON depense(date_depense);
+CREATE INDEX IF NOT EXISTS idx_depense_payeur ON depense(payeur_nom);
+"""
+
+
+def db_path(path):
+    """storage.json -> storage.db"""
+    base, _ = os.path.splitext(path)
+    return base + ".db"
+
+
+def change_counter(path):
+    """Compteur de modifications de l'en-tête de la base (incrémenté à chaque transaction écrite), ou None."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(28)
+    except FileNotFoundError:
+        return None
+    return int.from_bytes(header[24:28], "big") if len(header) == 28 else 0
+
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _to_row(kind, item):
+    _, cols = TABLES[kind]
+    row = [str(item["id"])]
+    for c in cols:
+        v = item.get(c)
+        if c.startswith("date_") and v is not None:
+            v = str(v)
+        elif c in BOOL_COLUMNS:
+            v = int(bool(v))
+        row.append(v)
+    return row
+
+
+def _from_row(row):
+    item = dict(row)
+    for c in BOOL_COLUMNS:
+        if c in item and item[c] is not None:
+            item[c] = bool(item[c])
+    return item
+
+
+def _insert_sql(kind):
+    table, cols = TABLES[kind]
+    names = ["id"] + cols
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+
+def _date_clause(start_date, end_date):
+    """Clause WHERE sur date_depense (dates ISO : l'ordre texte est l'ordre chronologique)."""
+    conds, params = [], []
+    if start_date:
+        conds.append("date_depense >= ?")
+        params.append(str(start_date))
+    if end_date:
+        conds.append("date_depense <= ?")
+        params.append(str(end_date))
+    if conds:
+        conds.insert(0, "date_depense IS NOT NULL AND date_depense != ''")
+    return (" WHERE " + " AND ".join(conds)) if conds else "", params
+
+
+def load_state(path):
+    with closing(connect(path)) as conn:
+        people = [_from_row(r) for r in conn.execute("SELECT * FROM person ORDER BY rowid")]
+        depenses = [_from_row(r) for r in conn.execute("SELECT * FROM depense ORDER BY rowid")]
+    return people, depenses
+
+
+def load_people(path):
+    with closing(connect(path)) as conn:
+        return [_from_row(r) for r in conn.execute("SELECT * FROM person ORDER BY rowid")]
+
+
+def save_state(people, depenses, path):
+    with closing(connect(path)) as conn, conn:
+        conn.execute("DELETE FROM person")
+        conn.execute("DELETE FROM depense")
+        conn.executemany(_insert_sql("people"), [_to_row("people", p) for p in people])
+        conn.executemany(_insert_sql("depenses"), [_to_row("depenses", d) for d in depenses])
+
+
+def add_item(kind, item, path):
+    add_items(kind, [item], path)
+
+
+def add_items(kind, items, path):
+    with closing(connect(path)) as conn, conn:
+        conn.executemany(_insert_sql(kind), (_to_row(kind, i) for i in items))
+
+
+def delete_item(kind, item_id, path):
+    delete_items(kind, [item_id], path)
+
+
+def delete_items(kind, item_ids, path):
+    table, _ = TABLES[kind]
+    with closing(connect(path)) as conn, conn:
+        conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in item_ids])
+
+
+def filter_depenses_by_date(path, start_date, end_date):
+    where, params = _date_clause(start_date, end_date)
+    with closing(connect(path)) as conn:
+        return [_from_row(r) for r in conn.execute(f"SELECT * FROM depense{where} ORDER BY rowid", params)]
+
+
+def totals(path, start_date=None, end_date=None):
+    """(total, total_alcool, total_viande) sur la période, calculés par SQLite."""
+    where, params = _date_clause(start_date, end_date)
+    sql = (
+        "SELECT COALESCE(SUM(prix_depense), 0),"
+        " COALESCE(SUM(CASE WHEN alcool_boolean THEN alcool_prix END), 0),"
+        " COALESCE(SUM(CASE WHEN nourriture_boolean THEN nourriture_prix END), 0)"
+        f" FROM depense{where}"
+    )
+    with closing(connect(path)) as conn:
+        return tuple(conn.execute(sql, params).fetchone())
+
+
+def paid_by(path, start_date=None, end_date=None):
+    """{payeur: montant payé} sur la période."""
+    where, params = _date_clause(start_date, end_date)
+    sql = (
+        "SELECT COALESCE(NULLIF(payeur_nom, ''), 'Inconnu') AS payeur, SUM(COALESCE(prix_depense, 0))"
+        f" FROM depense{where} GROUP BY payeur"
+    )
+    with closing(connect(path)) as conn:
+        return {r[0]: r[1] for r in conn.execute(sql, params)}
+
+
+def series_by_date(path, start_date=None, end_date=None):
+    """[(date ISO, montant)] triés par date, jours sans dépense exclus."""
+    where, params = _date_clause(start_date, end_date)
+    where = where or " WHERE date_depense IS NOT NULL AND date_depense != ''"
+    sql = f"SELECT date_depense, SUM(COALESCE(prix_depense, 0)) FROM depense{where} GROUP BY date_depense ORDER BY date_depense"
+    with closing(connect(path)) as conn:
+        return [(r[0], r[1]) for r in conn.execute(sql, params)]
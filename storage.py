@@ -0,0 +1,661 @@
+# storage.py
+import json
+import os
+import datetime
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from uuid import uuid4  # IDs uniques
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import sqlite_store
+from instrumentation import instrument
+from aggregates import Aggregates
+from columnar import PeopleColumns, DepenseColumns
+from date_index import DateIndex
+from presence import compute_presence_shares
+
+STORAGE_FILE = "storage.json"
+
+# Version du format du fichier. Un fichier à jour (écrit par storage ou
+# migrate.py) est chargé sans aucune vérification de migration.
+# 1 : format historique, sans "schema_version" (id et date_depense parfois absents)
+# 2 : id stables sur chaque item, date_depense seule date des dépenses
+SCHEMA_VERSION = 2
+
+# "json" : chaque modification réécrit tout le fichier.
+# "journal" : chaque ajout/suppression ajoute une ligne au journal JSONL,
+# replié périodiquement dans le fichier principal (compaction).
+# "sqlite" : base SQLite indexée à côté du fichier (storage.db), cf. sqlite_store.py.
+STORAGE_MODE = os.environ.get("STORAGE_MODE", "json")
+JOURNAL_COMPACT_BYTES = 1_000_000  # taille du journal déclenchant la compaction
+
+KINDS = ("people", "depenses")
+
+# Nombre de fichiers (groupes) gardés en mémoire ; les moins récemment utilisés sont oubliés
+CACHE_MAX_FILES = int(os.environ.get("CACHE_MAX_FILES", "32"))
+
+# Cache LRU des données déjà parsées/migrées : chemin -> _CacheEntry
+_cache = OrderedDict()
+# _cache_lock ne protège que les accès au dictionnaire (jamais une lecture de
+# fichier) ; chaque fichier a son verrou, tenu pendant sa relecture : un gros
+# groupe chargé à froid ne bloque pas les sessions des autres groupes.
+_cache_lock = threading.Lock()
+_path_locks = {}  # chemin -> threading.Lock (un par groupe, jamais oublié)
+
+
+@contextmanager
+def file_lock(path=STORAGE_FILE):
+    """Verrou exclusif inter-processus sur le fichier de données (via <path>.lock).
+
+    Sérialise les écritures de toutes les sessions et de tous les processus ;
+    les lectures n'en ont pas besoin, les fichiers étant remplacés atomiquement.
+    """
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_key(path):
+    """(mtime_ns, taille) du fichier, ou None s'il n'existe pas."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def migrate_person(p):
+    """Ajoute l'id manquant (en place) ; renvoie True si l'item a changé."""
+    if "id" in p:
+        return False
+    p["id"] = str(uuid4())
+    return True
+
+
+def migrate_depense(d):
+    """date_depense à partir des anciennes dates, id manquant (en place) ; True si l'item a changé."""
+    changed = False
+    if "date_depense" not in d:
+        if "date_debut" in d and d["date_debut"]:
+            d["date_depense"] = d["date_debut"]
+        elif "date_fin" in d and d["date_fin"]:
+            d["date_depense"] = d["date_fin"]
+        else:
+            d["date_depense"] = str(datetime.date.today())
+        changed = True
+    if "date_debut" in d or "date_fin" in d:
+        d.pop("date_debut", None)
+        d.pop("date_fin", None)
+        changed = True
+    if "id" not in d:
+        d["id"] = str(uuid4())
+        changed = True
+    return changed
+
+
+@instrument()
+def migrate_state(people_raw, depenses_raw):
+    """Migre les anciens schémas (id manquant, dates anciennes)"""
+    people = list(people_raw)
+    for p in people:
+        migrate_person(p)
+    depenses = list(depenses_raw)
+    for d in depenses:
+        migrate_depense(d)
+    return people, depenses
+
+
+def journal_paths(path=STORAGE_FILE):
+    """(journal courant, journal en cours de compaction) associés au fichier principal."""
+    base, _ = os.path.splitext(path)
+    return base + ".journal.jsonl", base + ".journal.compacting.jsonl"
+
+
+class _CacheEntry:
+    """État chargé d'un fichier : items indexés par id + position de lecture du journal."""
+
+    def __init__(self, snap_key, comp_key, people, depenses, file_version=0):
+        self.snap_key = snap_key
+        self.comp_key = comp_key
+        self.file_version = file_version  # compteur "version" du fichier principal
+        self.journal_pos = 0
+        self.journal_id = None  # (st_dev, st_ino) du journal lu jusqu'à journal_pos
+        self.items = {
+            "people": {p["id"]: p for p in people},
+            "depenses": {d["id"]: d for d in depenses},
+        }
+        self._aggregates = None
+        self.version = 0  # incrémenté à chaque modification rejouée
+        self._derived = {}  # nom -> (version, structure dérivée des items)
+
+    @property
+    def aggregates(self):
+        """Totaux incrémentaux, construits au premier accès puis tenus à jour par apply()."""
+        if self._aggregates is None:
+            people, _, _, depense_columns = self.columns()
+            self._aggregates = Aggregates.from_columns(people, depense_columns)
+        return self._aggregates
+
+    def columns(self):
+        """(people, depenses, PeopleColumns, DepenseColumns) alignés, construits une fois par version."""
+        return self.derived("columns", lambda people, depenses: (
+            people, depenses, PeopleColumns(people), DepenseColumns(depenses)
+        ))
+
+    def derived(self, name, build):
+        """Structure construite par build(people, depenses), une fois par version des données."""
+        hit = self._derived.get(name)
+        if hit is None or hit[0] != self.version:
+            hit = (self.version, build(list(self.items["people"].values()), list(self.items["depenses"].values())))
+            self._derived[name] = hit
+        return hit[1]
+
+    def _track(self, kind, old, new):
+        self.version += 1
+        agg = self._aggregates
+        if agg is None:
+            return
+        add, remove = (agg.add_person, agg.remove_person) if kind == "people" else (agg.add_depense, agg.remove_depense)
+        if old is not None:
+            remove(old)
+        if new is not None:
+            add(new)
+
+    def apply(self, rec):
+        """Rejoue un enregistrement du journal (idempotent : indexé par id)."""
+        items = self.items.get(rec.get("kind"))
+        if items is None:
+            return
+        if rec.get("op") == "add":
+            item = rec.get("item") or {}
+            if rec["kind"] == "people":
+                item = migrate_state([item], [])[0][0]
+            else:
+                item = migrate_state([], [item])[1][0]
+            self._track(rec["kind"], items.get(item["id"]), item)
+            items[item["id"]] = item
+        elif rec.get("op") == "delete":
+            self._track(rec["kind"], items.pop(rec.get("id"), None), None)
+
+
+def _read_file(path, locked=False):
+    """(people, depenses, version) du fichier principal.
+
+    Chemin rapide pour un fichier au format SCHEMA_VERSION. Un fichier plus
+    ancien est migré puis réécrit aussitôt, sous file_lock (déjà pris par
+    l'appelant si locked=True) : les ids créés sont sur disque avant d'être
+    montrés ou référencés, et sont donc les mêmes à chaque lecture.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    people, depenses = data.get("people", []), data.get("depenses", [])
+    schema = data.get("schema_version", 1)
+    version = data.get("version", 0)
+    if schema > SCHEMA_VERSION:
+        raise ValueError(f"{path} : format {schema} plus récent que celui de l'application ({SCHEMA_VERSION})")
+    if schema < SCHEMA_VERSION:
+        if not locked:
+            with file_lock(path):
+                return _read_file(path, locked=True)
+        people, depenses = migrate_state(people, depenses)
+        version += 1
+        _write_snapshot(people, depenses, path, version)
+    return people, depenses, version
+
+
+def _read_state(path, locked=False):
+    return _read_file(path, locked)[:2]
+
+
+def _apply_lines(entry, chunk):
+    """Applique les lignes complètes de `chunk` ; renvoie le nombre d'octets consommés."""
+    # Une ligne sans "\n" final est en cours d'écriture : on la relira plus tard
+    end = chunk.rfind(b"\n") + 1
+    for line in chunk[:end].splitlines():
+        if line.strip():
+            entry.apply(json.loads(line))
+    return end
+
+
+def _replay(entry, journal):
+    """Applique tout le journal (lignes complètes) à l'entrée."""
+    try:
+        with open(journal, "rb") as f:
+            chunk = f.read()
+    except FileNotFoundError:
+        return
+    _apply_lines(entry, chunk)
+
+
+def _catch_up(entry, journal, path):
+    """Applique les lignes du journal écrites depuis la dernière lecture ; False si c'est impossible.
+
+    La position de lecture n'a de sens que dans le journal lu jusqu'ici et
+    tant que le fichier principal n'a pas changé : une compaction (d'une autre
+    session ou d'un autre processus) renomme le journal, réécrit le fichier
+    principal puis repart d'un journal neuf. Dans ce cas rien n'est appliqué
+    et l'entrée doit être relue.
+    """
+    try:
+        with open(journal, "rb") as f:
+            st = os.fstat(f.fileno())
+            ident = (st.st_dev, st.st_ino)
+            if entry.journal_pos and (ident != entry.journal_id or st.st_size < entry.journal_pos):
+                return False
+            f.seek(entry.journal_pos)
+            chunk = f.read()
+    except FileNotFoundError:
+        return not entry.journal_pos
+    if _file_key(path) != entry.snap_key:
+        return False
+    entry.journal_pos += _apply_lines(entry, chunk)
+    entry.journal_id = ident
+    return True
+
+
+@instrument()
+def load_state(path=STORAGE_FILE):
+    """Charge le storage.json (+ journal éventuel), parsé et migré une seule fois par version.
+
+    Tant que le fichier principal n'a pas changé (mtime et taille), seules les
+    nouvelles lignes du journal sont relues. En mode sqlite, la base n'est
+    relue que lorsqu'elle a été modifiée. Les listes renvoyées sont des
+    copies superficielles : l'appelant peut les modifier sans toucher au cache.
+    """
+    with _locked_entry(path) as entry:
+        return list(entry.items["people"].values()), list(entry.items["depenses"].values())
+
+
+def load_people(path=STORAGE_FILE):
+    """Participants seuls, pour les pages qui ne parcourent pas les dépenses.
+
+    En mode sqlite, seule la table des participants est lue.
+    """
+    if STORAGE_MODE == "sqlite":
+        return sqlite_store.load_people(_sqlite_db(path))
+    with _locked_entry(path) as entry:
+        return list(entry.items["people"].values())
+
+
+def _sqlite_db(path):
+    """Base SQLite du fichier, créée au premier accès à partir du storage.json existant."""
+    db = sqlite_store.db_path(path)
+    if not os.path.exists(db) and os.path.exists(path):
+        with file_lock(path):
+            if not os.path.exists(db):
+                sqlite_store.save_state(*_read_state(path, locked=True), db)
+    return db
+
+
+@contextmanager
+def _locked_entry(path):
+    """Entrée de cache à jour du fichier (ou de sa base SQLite), sous le verrou propre à ce fichier."""
+    sqlite = STORAGE_MODE == "sqlite"
+    with _path_lock(sqlite_store.db_path(path) if sqlite else path):
+        yield _refresh_sqlite(path) if sqlite else _refresh(path)
+
+
+def _path_lock(key):
+    with _cache_lock:
+        return _path_locks.setdefault(key, threading.Lock())
+
+
+def _cached(key, entry=None):
+    """Entrée en cache de `key` (marquée récente), ou y range `entry` en oubliant les plus anciennes."""
+    with _cache_lock:
+        if entry is None:
+            entry = _cache.get(key)
+            if entry is None:
+                return None
+        else:
+            _cache[key] = entry
+            while len(_cache) > CACHE_MAX_FILES:
+                _cache.popitem(last=False)
+        _cache.move_to_end(key)
+        return entry
+
+
+def _sqlite_key(db):
+    """Version de la base : (mtime, taille) et compteur de l'en-tête, qui couvre deux
+    écritures de même taille dans le même tick de mtime."""
+    return (_file_key(db), sqlite_store.change_counter(db))
+
+
+def _refresh_sqlite(path):
+    """Entrée de cache de la base SQLite, relue seulement quand la base change ; à appeler sous _locked_entry."""
+    db = _sqlite_db(path)
+    # Clé lue avant la base : une écriture concurrente donne au pire une relecture de trop
+    key = _sqlite_key(db)
+    entry = _cached(db)
+    if entry is None or entry.snap_key != key:
+        entry = _cached(db, _CacheEntry(key, None, *sqlite_store.load_state(db)))
+    return entry
+
+
+def _refresh(path):
+    """Met à jour (ou crée) l'entrée de cache du fichier ; à appeler sous _locked_entry."""
+    journal, compacting = journal_paths(path)
+    while True:
+        snap_key = _file_key(path)
+        comp_key = _file_key(compacting)
+        entry = _cached(path)
+        if entry is None or entry.snap_key != snap_key or entry.comp_key != comp_key:
+            try:
+                people, depenses, version = _read_file(path) if snap_key is not None else ([], [], 0)
+            except FileNotFoundError:
+                people, depenses, version = [], [], 0
+            entry = _CacheEntry(snap_key, comp_key, people, depenses, version)
+            if comp_key is not None:
+                _replay(entry, compacting)
+            _cached(path, entry)
+        if _catch_up(entry, journal, path):
+            return entry
+        # Compaction terminée entre-temps : relecture complète
+        invalidate_cache(path)
+
+
+def data_version(path=STORAGE_FILE):
+    """Identifiant de la version courante des données (change à chaque modification).
+
+    En mode sqlite, lu sur le fichier de la base, sans charger les données.
+    """
+    if STORAGE_MODE == "sqlite":
+        return (path, _sqlite_key(_sqlite_db(path)))
+    with _locked_entry(path) as entry:
+        return (path, entry.snap_key, entry.comp_key, entry.version)
+
+
+@instrument()
+def load_aggregates(path=STORAGE_FILE):
+    """Totaux par catégorie, par payeur et parts dues de l'état courant (cf. aggregates.py).
+
+    Construits une fois par version du fichier principal (ou de la base en
+    mode sqlite), puis mis à jour ligne à ligne à la relecture du journal.
+    """
+    with _locked_entry(path) as entry:
+        return entry.aggregates
+
+
+@instrument()
+def load_date_index(path=STORAGE_FILE):
+    """Index trié par date_depense de l'état courant (cf. date_index.py)."""
+    with _locked_entry(path) as entry:
+        _, depenses, _, columns = entry.columns()
+        return entry.derived("date_index", lambda *_: DateIndex(depenses, columns))
+
+
+@instrument()
+def load_presence_shares(path=STORAGE_FILE):
+    """Parts dues au prorata de la présence (cf. presence.py), calculées une fois par version des données."""
+    with _locked_entry(path) as entry:
+        people, depenses, _, columns = entry.columns()
+        return dict(entry.derived("presence_shares", lambda *_: compute_presence_shares(people, depenses, columns)))
+
+
+@instrument()
+def load_columns(path=STORAGE_FILE):
+    """(PeopleColumns, DepenseColumns) de l'état courant (cf. columnar.py), une fois par version des données."""
+    with _locked_entry(path) as entry:
+        return entry.columns()[2:]
+
+
+def invalidate_cache(path=None):
+    """Oublie le cache d'un fichier (ou de tous si path est None)."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
+            _cache.pop(sqlite_store.db_path(path), None)
+
+
+def _write_snapshot(people, depenses, path, version=0):
+    """Écriture atomique : fichier temporaire complet puis renommage.
+
+    Un arrêt en cours d'écriture laisse l'ancien fichier intact ; les lecteurs
+    voient l'ancienne ou la nouvelle version, jamais un fichier tronqué.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schema_version": SCHEMA_VERSION, "version": version, "people": people, "depenses": depenses},
+                      f, ensure_ascii=False, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _current(path):
+    """État à jour du fichier (journaux inclus), relu sous file_lock : (entrée, version du fichier)."""
+    journal, compacting = journal_paths(path)
+    try:
+        people, depenses, version = _read_file(path, locked=True)
+    except FileNotFoundError:
+        people, depenses, version = [], [], 0
+    entry = _CacheEntry(None, None, people, depenses, version)
+    for j in (compacting, journal):
+        _replay(entry, j)
+    return entry
+
+
+def _remove_journals(path):
+    for j in journal_paths(path):
+        try:
+            os.remove(j)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def _writer_cache(path):
+    """Sous file_lock : entrée en cache du fichier, rattrapée jusqu'à l'état sur disque, ou None.
+
+    Le verrou du fichier est pris sans attente (un lecteur qui le tient peut
+    attendre file_lock pour une migration) et gardé pendant la réécriture.
+    Sans entrée à jour, le cache du fichier est oublié à la sortie.
+    """
+    lock = _path_lock(path)
+    held = lock.acquire(blocking=False)
+    entry = None
+    try:
+        if held:
+            journal, compacting = journal_paths(path)
+            entry = _cached(path)
+            if entry is not None and (entry.snap_key, entry.comp_key) == (_file_key(path), _file_key(compacting)):
+                # Sous file_lock, le journal ne contient que des lignes complètes
+                if not _catch_up(entry, journal, path):
+                    entry = None
+            else:
+                entry = None
+        yield entry
+    finally:
+        if entry is None:
+            invalidate_cache(path)
+        if held:
+            lock.release()
+
+
+def _settle(entry, path, file_version):
+    """L'entrée correspond au fichier tout juste réécrit, sans journal."""
+    entry.snap_key, entry.comp_key, entry.journal_pos, entry.journal_id = _file_key(path), None, 0, None
+    entry.file_version = file_version
+
+
+def _commit(records, path):
+    """Applique des ajouts/suppressions à la dernière version du fichier et la réécrit.
+
+    Lecture et écriture se font sous file_lock : deux sessions qui ajoutent
+    en même temps voient chacune la modification de l'autre (rien n'est perdu).
+    """
+    with file_lock(path), _writer_cache(path) as cached:
+        entry = _current(path)
+        for rec in records:
+            entry.apply(rec)
+        _write_snapshot(list(entry.items["people"].values()), list(entry.items["depenses"].values()),
+                        path, entry.file_version + 1)
+        _remove_journals(path)
+        if cached is not None:
+            # Totaux tenus à jour ligne à ligne plutôt que reconstruits (cf. _CacheEntry.apply)
+            for rec in records:
+                cached.apply(rec)
+            _settle(cached, path, entry.file_version + 1)
+
+
+def _record(op, kind, item=None, item_id=None):
+    if kind not in KINDS:
+        raise ValueError(f"Type inconnu : {kind}")
+    rec = {"op": op, "kind": kind}
+    if op == "add":
+        rec["item"] = item
+    elif op == "delete":
+        rec["id"] = item_id
+    else:
+        raise ValueError(f"Opération inconnue : {op}")
+    return rec
+
+
+def _journal_record(op, kind, item=None, item_id=None):
+    rec = _record(op, kind, item, item_id)
+    if op == "add":
+        # Id et dates fixés avant l'écriture : le rejeu (et la compaction) ne doit
+        # jamais créer d'id, sinon une suppression ultérieure ne le retrouverait pas
+        (migrate_person if kind == "people" else migrate_depense)(item)
+    return json.dumps(rec, ensure_ascii=False, default=str) + "\n"
+
+
+def _append_lines(lines, path):
+    journal, _ = journal_paths(path)
+    # Sous file_lock : une compaction ne peut pas renommer le journal pendant l'écriture
+    with file_lock(path), open(journal, "a", encoding="utf-8") as f:
+        f.write("".join(lines))
+        size = f.tell()
+    if size >= JOURNAL_COMPACT_BYTES:
+        compact(path)
+
+
+def append_journal(op, kind, path=STORAGE_FILE, item=None, item_id=None):
+    """Ajoute un enregistrement au journal (coût constant, quelle que soit la taille de l'historique)."""
+    _append_lines([_journal_record(op, kind, item, item_id)], path)
+
+
+def compact(path=STORAGE_FILE):
+    """Replie le journal dans le fichier principal.
+
+    Le journal est d'abord renommé : les ajouts concurrents repartent dans un
+    journal neuf pendant la compaction. Le rejeu étant idempotent, un arrêt en
+    cours de route ne perd ni ne duplique rien.
+    """
+    journal, compacting = journal_paths(path)
+    with file_lock(path), _writer_cache(path) as cached:
+        if not os.path.exists(compacting):
+            try:
+                os.rename(journal, compacting)
+            except FileNotFoundError:
+                return
+        try:
+            people, depenses, version = _read_file(path, locked=True)
+        except FileNotFoundError:
+            people, depenses, version = [], [], 0
+        entry = _CacheEntry(None, None, people, depenses, version)
+        _replay(entry, compacting)
+        _write_snapshot(list(entry.items["people"].values()), list(entry.items["depenses"].values()),
+                        path, version + 1)
+        os.remove(compacting)
+        if cached is not None:
+            # Mêmes données, repliées : l'entrée garde ses totaux
+            _settle(cached, path, version + 1)
+
+
+def record_add(kind, item, path=STORAGE_FILE):
+    """Persiste l'ajout de `item` selon STORAGE_MODE.
+
+    Seule l'opération est enregistrée : les modifications faites entre-temps
+    par d'autres sessions sont conservées.
+    """
+    if STORAGE_MODE == "journal":
+        append_journal("add", kind, path, item=item)
+    elif STORAGE_MODE == "sqlite":
+        sqlite_store.add_item(kind, item, sqlite_store.db_path(path))
+    else:
+        _commit([_record("add", kind, item=item)], path)
+
+
+def record_add_many(kind, items, path=STORAGE_FILE):
+    """Persiste en une seule écriture l'ajout de plusieurs items."""
+    if not items:
+        return
+    if STORAGE_MODE == "journal":
+        _append_lines([_journal_record("add", kind, item=i) for i in items], path)
+    elif STORAGE_MODE == "sqlite":
+        sqlite_store.add_items(kind, items, sqlite_store.db_path(path))
+    else:
+        _commit([_record("add", kind, item=i) for i in items], path)
+
+
+def record_delete(kind, item_id, path=STORAGE_FILE):
+    """Persiste la suppression de `item_id` selon STORAGE_MODE."""
+    if STORAGE_MODE == "journal":
+        append_journal("delete", kind, path, item_id=item_id)
+    elif STORAGE_MODE == "sqlite":
+        sqlite_store.delete_item(kind, item_id, sqlite_store.db_path(path))
+    else:
+        _commit([_record("delete", kind, item_id=item_id)], path)
+
+
+def record_delete_many(kind, item_ids, path=STORAGE_FILE):
+    """Persiste en une seule écriture la suppression de plusieurs items."""
+    item_ids = list(item_ids)
+    if not item_ids:
+        return
+    if STORAGE_MODE == "journal":
+        _append_lines([_journal_record("delete", kind, item_id=i) for i in item_ids], path)
+    elif STORAGE_MODE == "sqlite":
+        sqlite_store.delete_items(kind, item_ids, sqlite_store.db_path(path))
+    else:
+        _commit([_record("delete", kind, item_id=i) for i in item_ids], path)
+
+
+# ------------------ Administration ------------------
+def replace_state(people, depenses, path=STORAGE_FILE):
+    """Remplace sans condition tout le contenu du stockage (restauration, jeux de test, benchmarks).
+
+    Réservé à l'administration : tout ce qu'ont écrit les autres sessions est
+    perdu, journal compris. Les vues passent par record_add / record_delete,
+    qui fusionnent avec la dernière version du fichier.
+    """
+    # Le stockage est marqué SCHEMA_VERSION : les items doivent être au format courant
+    people, depenses = migrate_state(people, depenses)
+    if STORAGE_MODE == "sqlite":
+        sqlite_store.save_state(people, depenses, sqlite_store.db_path(path))
+        return
+    with file_lock(path):
+        try:
+            version = _read_file(path, locked=True)[2]
+        except FileNotFoundError:
+            version = 0
+        _write_snapshot(people, depenses, path, version + 1)
+        _remove_journals(path)
+    invalidate_cache(path)
@@ -0,0 +1,96 @@
+# ui.py
+import streamlit as st
+
+from exporter import build_export, parquet_available
+from instrumentation import span
+from pagination import PAGE_SIZES, search_items, paginate
+from storage import data_version
+
+
+def current_store():
+    """Fichier de données du groupe actif (choisi dans la barre latérale par app.py)."""
+    return st.session_state["store"]
+
+
+def paged_selection(items, key, columns, search_fields):
+    """Tableau paginé (recherche + taille de page) avec une case « Supprimer » par ligne.
+
+    Seule la page courante est envoyée au navigateur : le nombre de widgets
+    reste le même quelle que soit la taille des données. Renvoie les ids cochés.
+    """
+    import pandas as pd
+
+    c1, c2 = st.columns([4, 1])
+    query = c1.text_input("🔎 Rechercher", key=f"{key}_search")
+    page_size = c2.selectbox("Lignes par page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    found = search_items(items, query, search_fields)
+
+    _, n_pages = paginate(found, 1, page_size)
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page_num = st.number_input(f"Page (sur {n_pages})", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+    rows, _ = paginate(found, int(page_num), page_size)
+
+    with span("DataFrame"):
+        df = pd.DataFrame([{c: x.get(c) for c in columns} for x in rows], columns=columns)
+        df.insert(0, "Supprimer", False)
+    edited = st.data_editor(
+        df,
+        hide_index=True,
+        use_container_width=True,
+        disabled=columns,
+        column_config={"id": None, "Supprimer": st.column_config.CheckboxColumn("Supprimer")},
+        key=f"{key}_editor_{page_num}_{page_size}_{query}",
+    )
+    st.caption(f"{len(found)} résultat(s) · page {page_num}/{n_pages}")
+    return edited.loc[edited["Supprimer"], "id"].tolist()
+
+
+def plot(fig):
+    """Affiche une figure Plotly (rendu mesuré par l'instrumentation)."""
+    with span("plotly (rendu)"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def export_panel(get_data, key, basename):
+    """Export à la demande : rien n'est sérialisé tant qu'on ne clique pas sur « Préparer l'export ».
+
+    get_data() renvoie (people, depenses) ; il n'est appelé qu'au clic.
+    """
+    formats = ["json", "csv"] + (["parquet"] if parquet_available() else [])
+    c1, c2 = st.columns(2)
+    fmt = c1.selectbox("Format", formats, key=f"{key}_fmt",
+                       help="JSON : participants + dépenses · CSV / Parquet : dépenses")
+    compress = c2.checkbox("Compresser (gzip)", key=f"{key}_gz")
+    # Un export préparé avant une modification des données n'est plus proposé
+    sig = (data_version(current_store()), fmt, compress, basename)
+    if st.button("Préparer l'export", key=f"{key}_build"):
+        st.session_state[f"{key}_data"] = (sig, build_export(*get_data(), fmt, compress, basename))
+    prepared = st.session_state.get(f"{key}_data")
+    if prepared and prepared[0] == sig:
+        data, filename, mime = prepared[1]
+        st.download_button(f"📥 Télécharger {filename}", data, file_name=filename, mime=mime, key=f"{key}_dl")
+
+
+def css_theme(dark: bool):
+    """Applique un thème clair/sombre simple via CSS."""
+    if dark:
+        bg = "#0E1117"
+        text = "#FAFAFA"
+        card = "#1E222A"
+    else:
+        bg = "#FFFFFF"
+        text = "#0E0E0E"
+        card = "#F6F6F6"
+    st.markdown(
+        f"""
+        <style>
+        .stApp {{ background-color: {bg}; color: {text}; }}
+        .stMarkdown, .stMetric {{ color: {text} !important; }}
+        .stDataFrame, .stExpander, .stButton>button, .stSelectbox, .stTextInput, .stNumberInput, .stDateInput {{
+            background: {card} !important; color: {text} !important;
+        }}
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
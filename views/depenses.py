@@ -0,0 +1,112 @@
+# views/depenses.py
+import datetime
+from dataclasses import asdict
+from uuid import uuid4  # IDs uniques
+
+import streamlit as st
+
+from models import Depense
+from storage import load_state, record_add, record_add_many, record_delete_many
+from importer import import_depenses
+from ui import current_store, paged_selection
+
+STORE = current_store()
+people, depenses = load_state(STORE)
+
+st.header("💰 Dépenses")
+
+if not people:
+    st.warning("⚠️ Vous devez enregistrer au moins un participant avant d'ajouter une dépense.")
+    st.stop()
+
+with st.form("add_depense"):
+    nom = st.text_input("Nom de la dépense")
+    prix_depense = st.number_input("Prix total (€)", min_value=0.0, step=1.0)
+
+    alcool_boolean = st.checkbox("Est ce que cette dépense contient de l'alcool ? 🍷")
+    alcool_prix = st.number_input("Prix concernant l'achat d'alcool (€)", min_value=0.0, step=1.0)
+
+    nourriture_boolean = st.checkbox("Est ce que cette dépense contient l'achat de viande ? 🍖")
+    nourriture_prix = st.number_input("Prix concernant l'achat de viande (€)", min_value=0.0, step=1.0)
+
+    date_depense = st.date_input("Date de la dépense", datetime.date.today())
+
+    # --- Qui a payé ? ---
+    noms_participants = [p.get("nom","").strip() for p in people if p.get("nom","").strip()]
+    payeur_nom = None
+    if not noms_participants:
+        st.warning("⚠️ Ajoute au moins un participant avec un nom avant d’enregistrer une dépense.")
+    elif len(noms_participants) == 1:
+        payeur_nom = noms_participants[0]
+        st.info(f"Payeur par défaut : **{payeur_nom}** (seul participant nommé).")
+    else:
+        payeur_nom = st.selectbox("Qui a payé ?", options=noms_participants, key="payeur_select")
+
+    submitted = st.form_submit_button("Ajouter")
+    if submitted:
+        if not noms_participants:
+            st.error("Impossible d'ajouter : aucun participant nommé.")
+        elif payeur_nom is None:
+            st.error("Merci de choisir le payeur.")
+        elif alcool_prix + nourriture_prix > prix_depense:
+            st.error("La somme alcool + viande dépasse le prix total.")
+        else:
+            d = Depense(
+                nom=nom,
+                prix_depense=prix_depense,
+                alcool_boolean=alcool_boolean,
+                alcool_prix=alcool_prix,
+                nourriture_boolean=nourriture_boolean,
+                nourriture_prix=nourriture_prix,
+                date_depense=date_depense
+            )
+            depense_dict = asdict(d)
+            depense_dict["id"] = str(uuid4())
+            depense_dict["payeur_nom"] = payeur_nom
+            record_add("depenses", depense_dict, STORE)
+            st.success(f"Dépense ajoutée : {nom}")
+            st.rerun()
+
+# --- Import en masse (CSV / JSON / JSONL) ---
+with st.expander("📤 Importer des dépenses (CSV, relevé bancaire, JSON)"):
+    st.caption(
+        "Colonnes reconnues : nom/libellé, prix/montant, date (AAAA-MM-JJ ou JJ/MM/AAAA), payeur, "
+        "alcool_prix, nourriture_prix (+ alcool/viande oui/non). Les payeurs doivent être des participants."
+    )
+    uploaded = st.file_uploader("Fichier", type=["csv", "json", "jsonl"], key="import_file")
+    if uploaded is not None and st.button("Importer", key="import_depenses"):
+        items, report = import_depenses(uploaded, people, filename=uploaded.name)
+        record_add_many("depenses", items, STORE)
+        st.session_state["import_report"] = report
+        st.rerun()
+    report = st.session_state.pop("import_report", None)
+    if report:
+        st.success(f"{report['importees']} dépense(s) importée(s) sur {report['lues']} ligne(s) lue(s).")
+        if "erreur" in report:
+            st.error(f"Fichier partiellement importé : {report['erreur']}")
+        if report["rejetees"]:
+            st.warning(f"{report['rejetees']} ligne(s) rejetée(s).")
+            import pandas as pd  # seulement s'il y a des rejets à afficher
+
+            st.dataframe(
+                pd.DataFrame(report["detail_rejets"], columns=["Ligne", "Motif"]),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+st.subheader("Liste des dépenses")
+if not depenses:
+    st.info("Aucune dépense enregistrée.")
+else:
+    selected = paged_selection(
+        depenses,
+        "depenses",
+        ["id", "nom", "date_depense", "payeur_nom", "prix_depense",
+         "alcool_boolean", "alcool_prix", "nourriture_boolean", "nourriture_prix"],
+        ["nom", "payeur_nom", "date_depense"],
+    )
+    if st.button(f"🗑️ Supprimer la sélection ({len(selected)})", disabled=not selected, key="del_depenses"):
+        ids = set(selected)
+        record_delete_many("depenses", ids, STORE)
+        st.success(f"{len(ids)} dépense(s) supprimée(s)")
+        st.rerun()
@@ -0,0 +1,71 @@
+# views/participants.py
+import datetime
+from dataclasses import asdict
+from uuid import uuid4  # IDs uniques
+
+import streamlit as st
+
+from models import Person
+from storage import load_people, record_add, record_delete_many
+from ui import current_store, paged_selection
+
+STORE = current_store()
+people = load_people(STORE)
+
+st.header("👥 Participants")
+with st.form("add_person"):
+    nom = st.text_input("Nom")
+    if not nom.strip():
+        st.caption("⚠️ Le nom ne peut pas être vide.")
+
+    alcool_boolean = st.checkbox("Bois-tu de l'alcool ? 🍷")
+    alcool_classification = st.number_input(
+        "Par rapport aux autres personnes renseignées sur ce groupe, note sur une échelle de 1 à 10 ta consommation d'alcool",
+        min_value=1, max_value=10, step=1, value=5
+    )
+
+    nourriture_boolean = st.checkbox("Manges-tu de la viande ? 🍖")
+    nourriture_classification = st.number_input(
+        "Par rapport aux autres personnes renseignées sur ce groupe, note sur une échelle de 1 à 10 ta consommation de nourriture espèce de gros mangeur",
+        min_value=1, max_value=10, step=1, value=5
+    )
+
+    date_arrive = st.date_input("Date d'arrivée", datetime.date.today())
+    date_depart = st.date_input("Date de départ", datetime.date.today())
+
+    submitted = st.form_submit_button("Ajouter")
+    if submitted:
+        if not nom.strip():
+            st.error("Merci de renseigner un nom avant d'ajouter.")
+        else:
+            p = Person(
+                nom.strip(),
+                alcool_boolean,
+                int(alcool_classification),
+                nourriture_boolean,
+                int(nourriture_classification),
+                date_arrive,
+                date_depart
+            )
+            person_dict = asdict(p)
+            person_dict["id"] = str(uuid4())
+            record_add("people", person_dict, STORE)
+            st.success(f"Ajouté : {nom}")
+            st.rerun()
+
+st.subheader("Liste des participants")
+if not people:
+    st.info("Aucun participant enregistré.")
+else:
+    selected = paged_selection(
+        people,
+        "people",
+        ["id", "nom", "alcool_boolean", "alcool_classification",
+         "nourriture_boolean", "nourriture_classification", "date_arrive", "date_depart"],
+        ["nom"],
+    )
+    if st.button(f"🗑️ Supprimer la sélection ({len(selected)})", disabled=not selected, key="del_people"):
+        ids = set(selected)
+        record_delete_many("people", ids, STORE)
+        st.success(f"{len(ids)} participant(s) supprimé(s)")
+        st.rerun()
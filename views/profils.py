@@ -0,0 +1,50 @@
+# views/profils.py
+import streamlit as st
+
+from storage import data_version, load_state
+from charts import profile_figures
+from ui import current_store, plot
+
+STORE = current_store()
+people, depenses = load_state(STORE)
+
+st.header("🧬 Résumé des profils du groupe")
+
+if not people:
+    st.info("Aucun participant enregistré.")
+else:
+    # Listes
+    non_viande = [p["nom"] for p in people if p.get("nom") and not p.get("nourriture_boolean")]
+    boivent = [p["nom"] for p in people if p.get("nom") and p.get("alcool_boolean")]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("🚫 Ne mangent pas de viande")
+        if non_viande:
+            for n in non_viande:
+                st.write(f"• {n}")
+        else:
+            st.caption("Tout le monde mange de la viande.")
+
+    with col2:
+        st.subheader("🍷 Boivent de l'alcool")
+        if boivent:
+            for n in boivent:
+                st.write(f"• {n}")
+        else:
+            st.caption("Personne ne boit d'alcool.")
+
+    # Camemberts d'intensité par personne
+    st.subheader("🥧 Répartition des intensités de consommation")
+
+    # Pondéré par note, 0 si ne mange pas de viande / ne boit pas
+    figs = profile_figures(data_version(STORE), people)
+    if figs["food"] is not None:
+        plot(figs["food"])
+    else:
+        st.caption("Pas de répartition nourriture (scores nuls ou personne ne mange de viande).")
+
+    if figs["alc"] is not None:
+        plot(figs["alc"])
+    else:
+        st.caption("Pas de répartition alcool (scores nuls ou personne ne boit).")
@@ -0,0 +1,85 @@
+# views/resume.py
+import streamlit as st
+
+import storage
+import sqlite_store
+from storage import data_version, load_people, load_state, load_aggregates, load_date_index
+from date_index import to_date
+from charts import resume_figures
+from ui import current_store, export_panel, plot
+
+STORE = current_store()
+people = load_people(STORE)  # les dépenses ne sont lues que pour l'export
+
+st.header("📈 Résumé des dépenses")
+
+# Filtres par période
+colf1, colf2 = st.columns(2)
+with colf1:
+    start_date = st.date_input("📅 Date de début (filtre)", value=None)
+with colf2:
+    end_date = st.date_input("📅 Date de fin (filtre)", value=None)
+
+if storage.STORAGE_MODE == "sqlite":
+    # Filtre et totaux calculés par SQLite (index sur date_depense)
+    db = sqlite_store.db_path(STORE)
+    total, total_alcool, total_viande = sqlite_store.totals(db, start_date, end_date)
+else:
+    index = load_date_index(STORE)
+    if not start_date and not end_date:
+        # Sans filtre : totaux incrémentaux, pas de nouveau passage sur les dépenses
+        agg = load_aggregates(STORE)
+        total, total_alcool, total_viande = agg.total, agg.total_alcool, agg.total_viande
+    else:
+        # Période résolue par recherche dichotomique dans l'index trié par date
+        total, total_alcool, total_viande = index.totals(start_date, end_date)
+total_autres = max(total - total_alcool - total_viande, 0.0)
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("💰 Total dépenses", f"{total:.2f} €")
+c2.metric("🍷 Total alcool", f"{total_alcool:.2f} €")
+c3.metric("🍖 Total viande", f"{total_viande:.2f} €")
+c4.metric("🧾 Autres", f"{total_autres:.2f} €")
+
+st.subheader("📊 Graphiques")
+
+def chart_inputs():
+    """Série par jour et payé par payeur (seulement si les figures ne sont pas en cache)."""
+    if storage.STORAGE_MODE == "sqlite":
+        series = {to_date(k): v for k, v in sqlite_store.series_by_date(db, start_date, end_date)}
+        series.pop(None, None)
+        return series, sqlite_store.paid_by(db, start_date, end_date)
+    if not start_date and not end_date:
+        return index.daily_series(None, None), dict(agg.paid_by)
+    return index.daily_series(start_date, end_date), index.paid_by(start_date, end_date)
+
+figs = resume_figures(
+    data_version(STORE), start_date, end_date, (total_alcool, total_viande, total_autres), chart_inputs
+)
+
+# 1) Répartition par type (camembert)
+plot(figs["types"])
+
+# 2) Évolution des dépenses dans le temps (ligne)
+if figs["line"] is not None:
+    plot(figs["line"])
+else:
+    st.info("Aucune dépense dans la période pour tracer l'évolution.")
+
+# 3) Part de chaque payeur (barres)
+if figs["pay"] is not None:
+    plot(figs["pay"])
+else:
+    st.info("Aucun paiement enregistré dans la période choisie.")
+
+# Export de la période filtrée
+st.subheader("📥 Exporter la période")
+
+def period_data():
+    if storage.STORAGE_MODE == "sqlite":
+        return people, sqlite_store.filter_depenses_by_date(db, start_date, end_date)
+    if not start_date and not end_date:
+        return people, load_state(STORE)[1]
+    return people, index.filter(start_date, end_date)
+
+export_panel(period_data, "export_periode", f"export_{start_date or 'debut'}_{end_date or 'fin'}")
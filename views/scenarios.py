@@ -0,0 +1,49 @@
+# views/scenarios.py
+import pandas as pd
+import streamlit as st
+
+from storage import data_version, load_aggregates, load_columns, load_people
+from scenarios import MAX_SCENARIOS, run_scenarios, spread
+from charts import scenario_figure
+from ui import current_store, plot
+
+STORE = current_store()
+people = load_people(STORE)
+
+st.header("🎲 Scénarios de pondération")
+st.caption(
+    "Et si les notes ou les catégories étaient différentes ? Les parts dues sont recalculées "
+    "pour des scénarios de référence et pour des milliers de notes perturbées au hasard, en un seul calcul matriciel."
+)
+
+if not people:
+    st.info("Aucun participant enregistré.")
+    st.stop()
+
+c1, c2, c3 = st.columns(3)
+n_random = c1.slider("Scénarios aléatoires", 0, MAX_SCENARIOS, 2000, step=500)
+sigma = c2.slider("Perturbation des notes (écart-type)", 0.0, 5.0, 1.5, step=0.5)
+seed = c3.number_input("Graine", min_value=0, value=0, step=1)
+
+# Dernier résultat gardé dans la session seulement (n_scénarios x n_noms, trop gros pour un cache partagé)
+key = (data_version(STORE), n_random, sigma, int(seed))
+if st.session_state.get("scenarios_key") != key:
+    # Mêmes totaux répartissables (base, alcool, viande) que la Synthèse
+    people_columns, _ = load_columns(STORE)
+    st.session_state["scenarios"] = run_scenarios(people_columns, load_aggregates(STORE).split, n_random, sigma, int(seed))
+    st.session_state["scenarios_key"] = key
+names, labels, ref_dues, random_dues = st.session_state["scenarios"]
+if not names:
+    st.info("Aucun participant nommé.")
+    st.stop()
+
+st.subheader("📋 Scénarios de référence")
+df_ref = pd.DataFrame(ref_dues.T.round(2), index=names, columns=labels)
+df_ref.index.name = "Participant"
+st.dataframe(df_ref, use_container_width=True)
+
+if len(random_dues):
+    st.subheader(f"📊 Dispersion sur {len(random_dues)} scénarios aléatoires")
+    rows = spread(names, ref_dues[0], random_dues)
+    plot(scenario_figure(key, rows))
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
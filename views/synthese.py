@@ -0,0 +1,67 @@
+# views/synthese.py
+import pandas as pd
+import streamlit as st
+
+from storage import load_state, load_aggregates, load_presence_shares
+from aggregates import VERIFY_AGGREGATES
+from settlement import net_balances, settlement_plan, EXACT_MAX_PEOPLE
+from instrumentation import span
+from ui import current_store, export_panel
+
+STORE = current_store()
+people, depenses = load_state(STORE)
+
+st.header("📊 Synthèse")
+
+# Totaux globaux (pas de filtres ici), tenus à jour incrémentalement
+agg = load_aggregates(STORE)
+if VERIFY_AGGREGATES:
+    errors = agg.verify(people, depenses)
+    if errors:
+        st.warning("⚠️ Totaux incrémentaux incohérents : " + " · ".join(errors))
+total, total_alcool, total_viande = agg.total, agg.total_alcool, agg.total_viande
+
+c1, c2, c3 = st.columns(3)
+c1.metric("💰 Total dépenses", f"{total:.2f} €")
+c2.metric("🍷 Total alcool", f"{total_alcool:.2f} €")
+c3.metric("🍖 Total viande", f"{total_viande:.2f} €")
+
+# Équilibre pondéré (sur toutes les dépenses)
+st.subheader("⚖️ Équilibre des dépenses (pondéré)")
+if not people:
+    st.info("Aucun participant pour calculer l'équilibre.")
+else:
+    presence_mode = st.toggle(
+        "📅 Répartir chaque dépense entre les seuls présents (dates d'arrivée/départ)", value=False
+    )
+    dues = load_presence_shares(STORE) if presence_mode else agg.dues()
+    if not dues:
+        st.info("Aucune dépense enregistrée.")
+    else:
+        with span("DataFrame"):
+            df_dues = pd.DataFrame({"Participant": list(dues.keys()), "Part due (€)": list(dues.values())})
+        st.dataframe(df_dues, use_container_width=True)
+
+        # Qui rembourse qui ? (soldes payé - dû, au centime près)
+        st.subheader("💸 Remboursements")
+        modes = {"Automatique": "auto", "Rapide (glouton)": "greedy", "Exact (minimum de virements)": "exact"}
+        mode_label = st.selectbox("Mode de calcul", list(modes.keys()))
+        mode = modes[mode_label]
+        nonzero = sum(1 for b in net_balances(dues, agg.paid_by).values() if b)
+        if mode == "exact" and nonzero > EXACT_MAX_PEOPLE:
+            st.caption(f"Mode exact limité aux petits groupes (≤ {EXACT_MAX_PEOPLE} soldes) : calcul glouton.")
+            mode = "greedy"
+        balances, transfers = settlement_plan(dues, agg.paid_by, mode)
+        with span("DataFrame"):
+            df_bal = pd.DataFrame({"Participant": list(balances.keys()), "Solde (€)": list(balances.values())})
+        st.dataframe(df_bal, use_container_width=True)
+        if transfers:
+            with span("DataFrame"):
+                df_plan = pd.DataFrame(transfers, columns=["Qui paie", "À qui", "Montant (€)"])
+            st.dataframe(df_plan, use_container_width=True)
+        else:
+            st.success("Tout le monde est à l'équilibre, aucun remboursement nécessaire.")
+
+# Export global
+st.subheader("📥 Exporter (tout)")
+export_panel(lambda: (people, depenses), "export_total", "export_total")
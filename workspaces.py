@@ -0,0 +1,64 @@
+# workspaces.py
+import json
+import os
+import re
+import threading
+import unicodedata
+
+from storage import SCHEMA_VERSION, STORAGE_FILE
+
+# Un groupe = un fichier de données ; le groupe par défaut garde le storage.json historique
+WORKSPACES_DIR = os.environ.get("WORKSPACES_DIR", "workspaces")
+DEFAULT_WORKSPACE = "default"
+
+# Liste des groupes, relue seulement quand le dossier change : (mtime_ns, noms)
+_listing = None
+_listing_lock = threading.Lock()
+
+
+def slugify(name):
+    """'Vacances été 2024' -> 'vacances-ete-2024'"""
+    s = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    s = re.sub(r"[^a-zA-Z0-9]+", "-", s).strip("-").lower()
+    return s[:64]
+
+
+def workspace_path(slug):
+    """Fichier de données du groupe."""
+    if slug == DEFAULT_WORKSPACE:
+        return STORAGE_FILE
+    if slug != slugify(slug) or not slug:
+        raise ValueError(f"Nom de groupe invalide : {slug!r}")
+    return os.path.join(WORKSPACES_DIR, f"{slug}.json")
+
+
+def list_workspaces():
+    """Groupes existants (le groupe par défaut en premier)."""
+    global _listing
+    try:
+        mtime = os.stat(WORKSPACES_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return [DEFAULT_WORKSPACE]
+    with _listing_lock:
+        if _listing is None or _listing[0] != mtime:
+            names = sorted(
+                f[:-len(".json")] for f in os.listdir(WORKSPACES_DIR)
+                if f.endswith(".json")
+            )
+            _listing = (mtime, [DEFAULT_WORKSPACE] + [n for n in names if n != DEFAULT_WORKSPACE])
+        return list(_listing[1])
+
+
+def create_workspace(name):
+    """Crée un groupe vide (ou réutilise l'existant) et renvoie son identifiant."""
+    slug = slugify(name)
+    if not slug:
+        raise ValueError("Le nom du groupe ne peut pas être vide.")
+    path = workspace_path(slug)
+    if not os.path.exists(path):
+        # Fichier vide même en mode sqlite : c'est lui qui recense les groupes.
+        # Écrit au format courant : rien à migrer (cf. migrate.py --check)
+        os.makedirs(WORKSPACES_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"schema_version": SCHEMA_VERSION, "version": 0, "people": [], "depenses": []}, f)
+    return slug